@@ -7,6 +7,7 @@ from pyValkLib.containers.MXEN.MXEC.MXECInterface import EntityInterface
 from pyValkLib.containers.MXEN.MXEC.MXECInterface import GraphInterface, SubgraphInterface
 from pyValkLib.containers.MXEN.MXEC.MXECInterface import NodeInterface, EdgeInterface
 from pyValkLib.containers.MXEN.MXEC.MXECInterface import AssetInterface
+from pyValkLib.serialisation.StringPool import string_pool
 
 
 if __name__ == "CSVPack":
@@ -50,7 +51,7 @@ def pack_parameters(path, mi):
                         pi.ID = param_id
                     except Exception:
                         raise Exception(f"Attempted to pack {param_type} entry {row[0]}; could not convert ID to int.")
-                    pi.name = row[1]
+                    pi.name = string_pool.intern(row[1])
                     
                     # Since we currently have global parameter IDs, let's check
                     # that the ID hasn't already been registered
@@ -162,7 +163,7 @@ def pack_entities(path, mi):
                         ei.ID = int(row[0])
                     except Exception:
                         raise Exception(f"Attempted to pack {entity_type} entry {row[0]}; could not convert ID '{row[0]}' to int.")
-                    ei.name = row[1]
+                    ei.name = string_pool.intern(row[1])
                     try:
                         ei.controller_id = int(row[2])
                     except Exception:
@@ -275,7 +276,7 @@ def pack_paths(path, mi):
             if len(row) < 1:
                 path_name = ""
             else:
-                path_name = row[1]
+                path_name = string_pool.intern(row[1])
                     
             path_lookup[path_id] = path_name
     
@@ -485,7 +486,7 @@ def pack_assets(path, mi):
             ai.ID = asset_id
             ai.unknown_id_1 = int_row[1]
             ai.unknown_id_2 = int_row[2]
-            ai.filepath     = row[3]
+            ai.filepath     = string_pool.intern(row[3])
             
             # if asset_ID not in asset_types_lookup:
             #    raise Exception(f"Attempted to pack asset row '{row_idx}, ID {asset_ID}': CRITICAL INTERNAL ERROR. ASSET WAS NOT GIVEN A TYPE. PLEASE REPORT WITH FULL REPRODUCTION DETAILS.")
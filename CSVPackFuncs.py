@@ -1,5 +1,7 @@
 import struct
 
+from pyValkLib.serialisation.StringPool import string_pool
+
 class ExceptionMessageGenerator(Exception):
     __slots__ = ("error_msg",)
     
@@ -167,8 +169,8 @@ repack_funcs = {
     "path"       : lambda x: repack_int(x, "i"),
     "asset"      : lambda x: repack_int(x, "q"),
     "pointer32"  : lambda x: repack_int(x, "I"),
-    "utf8_string": lambda x: x,
-    "sjis_string": lambda x: x,
+    "utf8_string": lambda x: string_pool.intern(x),
+    "sjis_string": lambda x: string_pool.intern(x),
     "color32"    : lambda x: repack_color32(x),
     "color128"   : lambda x: repack_color128(x)   
 }
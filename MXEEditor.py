@@ -3,6 +3,10 @@ import os
 import sys
 
 from pyValkLib import MXE
+from pyValkLib.filetypes.RawMXE import RawMXE, compare_relocations
+from pyValkLib.containers.MXEN.MXEC.RelocationCache import RelocationCache
+from pyValkLib.containers.MXEN.MXEC.MXECInterface import MXECInterface
+from pyValkLib.containers.MXEN.MXEC.ValuePatch import get_value_patches
 
 from CSVExtract import interface_to_csvs
 from CSVPack import csvs_to_interface
@@ -15,6 +19,10 @@ usage_string = "Usage:\n" + \
                "  -r         : Packs/unpacks all MXEs in a supplied folder.\n" + \
                "  -u/--unpack: Unpacks an MXE file. If paired with '-r', it unpacks all MXEs in a folder.\n" + \
                "  -p/--pack  : Packs an MXE file. If paired with '-r', it packs all MXEs in a folder.\n" + \
+               "  -s/--swap  : Byteswaps an MXE file between big- and little-endian layouts without unpacking it. If paired with '-r', it converts all MXEs in a folder.\n" + \
+               "  -v/--verify: Checks that the relocation tables of a packed MXE are equivalent to those of the original given by -b/--base. If paired with '-r', it checks all MXEs in a folder against the MXEs of the same name in the -b/--base folder.\n" + \
+               "  -c/--cache : Directory of a relocation table cache to speed up packing files whose layout has not changed.\n" + \
+               "  -b/--base  : When packing, the original MXE (or folder of original MXEs if paired with '-r'). If only numeric, hex, or colour parameter values have changed, they are patched into a copy of it instead of fully packing.\n" + \
                "  -o/--out   : Output directory."
 
 def is_mxe_file(filepath):
@@ -26,17 +34,51 @@ def unpack_mxe_file(in_path, out_dir):
     interface_to_csvs(out_dir, mxec, os.path.splitext(os.path.split(in_path)[1])[0])
     hack_unfix_game_info_sys_param(in_path)
     
-def pack_mxe_file(in_path, out_path):
+def pack_mxe_file(in_path, out_path, relocation_cache=None, base_path=None):
     hack_fix_game_info_sys_param(in_path)
     filename = os.path.split(in_path)[1]
     mxec = csvs_to_interface(in_path)
-    mxe = MXE.init_from_mxecinterface(mxec)
-    mxe.write(os.path.join(out_path, filename + os.path.extsep + "mxe"))
+    out_file = os.path.join(out_path, filename + os.path.extsep + "mxe")
+    if base_path is None or not patch_mxe_file(mxec, base_path, out_file):
+        mxe = MXE.init_from_mxecinterface(mxec, relocation_cache=relocation_cache)
+        mxe.write(out_file)
     hack_unfix_game_info_sys_param(in_path)
 
+def patch_mxe_file(mxec, base_path, out_file):
+    with open(base_path, 'rb') as F:
+        base_data = F.read()
+    base = MXE()
+    base.read(base_data)
+    patches = get_value_patches(base.MXEN.MXEC, MXECInterface.from_subreader(base.MXEN.MXEC), mxec)
+    if patches is None:
+        return False
+    raw = RawMXE(base_data)
+    raw.patch(patches)
+    raw.write(out_file)
+    return True
+
+def swap_mxe_file(in_path, out_path):
+    mxe = RawMXE(in_path)
+    mxe.swap_endianness()
+    mxe.write(os.path.join(out_path, os.path.split(in_path)[1]))
+
+def verify_mxe_file(in_path, base_path):
+    divergences = compare_relocations(RawMXE(base_path), RawMXE(in_path))
+    for filetype, index, original_entry, rebuilt_entry in divergences:
+        print(f"{in_path}: {filetype} entry {index} differs. Original: {format_relocation_entry(original_entry)}, packed: {format_relocation_entry(rebuilt_entry)}.")
+    return not len(divergences)
+
+def format_relocation_entry(entry):
+    if entry is None:
+        return "(none)"
+    elif isinstance(entry, tuple):
+        return f"0x{entry[0]:x} (type {entry[1]})"
+    else:
+        return f"0x{entry:x}"
+
 def main(argv):
     try:
-        opts, args = getopt.getopt(argv,"hru:p:o:",["help","unpack=","pack=","out="])
+        opts, args = getopt.getopt(argv,"hru:p:s:v:c:b:o:",["help","unpack=","pack=","swap=","verify=","cache=","base=","out="])
     except getopt.GetoptError:
         print("Arg parsing error.")
         print(usage_string)
@@ -45,6 +87,10 @@ def main(argv):
     recursive = False
     unpack_path = None
     pack_path = None
+    swap_path = None
+    verify_path = None
+    cache_path = None
+    base_path = None
     output_path = None
     for opt, arg in opts:
         if opt == '-h':
@@ -60,6 +106,14 @@ def main(argv):
             if pack_path is not None:
                 print("Both pack and unpack locations specified. ONLY provide -u/--unpack or -p/--pack.")
                 sys.exit(2)
+            
+            if swap_path is not None:
+                print("Both swap and pack/unpack locations specified. ONLY provide one of -u/--unpack, -p/--pack, or -s/--swap.")
+                sys.exit(2)
+                
+            if verify_path is not None:
+                print("Both verify and pack/unpack/swap locations specified. ONLY provide one of -u/--unpack, -p/--pack, -s/--swap, or -v/--verify.")
+                sys.exit(2)
                 
             unpack_path = arg
         elif opt in ("-p", "--pack"):
@@ -70,21 +124,67 @@ def main(argv):
             if unpack_path is not None:
                 print("Both pack and unpack locations specified. ONLY provide -u/--unpack or -p/--pack.")
                 sys.exit(2)
+            
+            if swap_path is not None:
+                print("Both swap and pack/unpack locations specified. ONLY provide one of -u/--unpack, -p/--pack, or -s/--swap.")
+                sys.exit(2)
+                
+            if verify_path is not None:
+                print("Both verify and pack/unpack/swap locations specified. ONLY provide one of -u/--unpack, -p/--pack, -s/--swap, or -v/--verify.")
+                sys.exit(2)
                 
             pack_path = arg
+        elif opt in ("-s", "--swap"):
+            if swap_path is not None:
+                print("Swap location specified twice. ONLY provide -s or --swap.")
+                sys.exit(2)
+            
+            if unpack_path is not None or pack_path is not None:
+                print("Both swap and pack/unpack locations specified. ONLY provide one of -u/--unpack, -p/--pack, or -s/--swap.")
+                sys.exit(2)
+                
+            if verify_path is not None:
+                print("Both verify and pack/unpack/swap locations specified. ONLY provide one of -u/--unpack, -p/--pack, -s/--swap, or -v/--verify.")
+                sys.exit(2)
+                
+            swap_path = arg
+        elif opt in ("-v", "--verify"):
+            if verify_path is not None:
+                print("Verify location specified twice. ONLY provide -v or --verify.")
+                sys.exit(2)
+            
+            if unpack_path is not None or pack_path is not None or swap_path is not None:
+                print("Both verify and pack/unpack/swap locations specified. ONLY provide one of -u/--unpack, -p/--pack, -s/--swap, or -v/--verify.")
+                sys.exit(2)
+                
+            verify_path = arg
+        elif opt in ("-c", "--cache"):
+            cache_path = arg
+        elif opt in ("-b", "--base"):
+            base_path = arg
         elif opt in ("-o", "--out"):
             if output_path is not None:
                 print("Output location specified twice. ONLY provide -o or --out.")
                 sys.exit(2)
             output_path = arg
-            
+
+    if cache_path is not None and pack_path is None:
+        print("A relocation cache is only used when packing. ONLY provide -c/--cache with -p/--pack.")
+        sys.exit(2)
+
+    if base_path is not None and pack_path is None and verify_path is None:
+        print("An original MXE is only used when packing or verifying. ONLY provide -b/--base with -p/--pack or -v/--verify.")
+        sys.exit(2)
+
     if unpack_path is not None:
         if recursive:
             if output_path is None:
                 output_path = unpack_path
-            os.makedirs(output_path, exist_ok=True)
-            
             files = sorted([f for f in os.listdir(unpack_path) if is_mxe_file(os.path.join(unpack_path, f))])
+            if not len(files):
+                print(f"No MXE files found in {unpack_path}.")
+                sys.exit(2)
+            os.makedirs(output_path, exist_ok=True)
             n_files = len(files)
             longest_name = max([len(nm) for nm in files])
             print()
@@ -108,12 +208,15 @@ def main(argv):
                 print(f"{unpack_path} is not an MXE file.")
                 sys.exit(2)
     elif pack_path is not None:
+        relocation_cache = RelocationCache(cache_path) if cache_path is not None else None
         if recursive:
             if output_path is None:
                 output_path = pack_path
-            os.makedirs(output_path, exist_ok=True)
-            
             files = sorted([f for f in os.listdir(pack_path) if os.path.isdir(os.path.join(pack_path, f))])
+            if not len(files):
+                print(f"No unpacked MXE folders found in {pack_path}.")
+                sys.exit(2)
+            os.makedirs(output_path, exist_ok=True)
             n_files = len(files)
             longest_name = max([len(nm) for nm in files])
             print()
@@ -122,7 +225,10 @@ def main(argv):
                 padding = " "*diff
                 print(f"\rPacking file {i+1}/{n_files}... [{folder}]{padding}", end="")
                 filepath = os.path.join(pack_path, folder)
-                pack_mxe_file(filepath, output_path)
+                folder_base_path = None
+                if base_path is not None and is_mxe_file(os.path.join(base_path, folder + os.path.extsep + "mxe")):
+                    folder_base_path = os.path.join(base_path, folder + os.path.extsep + "mxe")
+                pack_mxe_file(filepath, output_path, relocation_cache, folder_base_path)
             print("\nDone.")
             sys.exit()
         else:
@@ -130,14 +236,66 @@ def main(argv):
                 output_path = os.path.split(pack_path)[0]
             if os.path.isdir(pack_path):
                 print(f"Packing {pack_path}...")
-                pack_mxe_file(pack_path, output_path)
+                pack_mxe_file(pack_path, output_path, relocation_cache, base_path)
                 print("Done.")
                 sys.exit()
             else:
                 print(f"{pack_path} is not a directory.")
                 sys.exit(2)
+    elif swap_path is not None:
+        if recursive:
+            if output_path is None:
+                output_path = os.path.join(swap_path, "swapped")
+            files = sorted([f for f in os.listdir(swap_path) if is_mxe_file(os.path.join(swap_path, f))])
+            if not len(files):
+                print(f"No MXE files found in {swap_path}.")
+                sys.exit(2)
+            os.makedirs(output_path, exist_ok=True)
+            n_files = len(files)
+            longest_name = max([len(nm) for nm in files])
+            print()
+            for i, file in enumerate(files):
+                diff = longest_name - len(file)
+                padding = " "*diff
+                print(f"\rSwapping file {i+1}/{n_files}... [{file}]{padding}", end="")
+                swap_mxe_file(os.path.join(swap_path, file), output_path)
+            print("\nDone.")
+            sys.exit()
+        else:
+            if output_path is None:
+                output_path = os.path.join(os.path.split(swap_path)[0], "swapped")
+            if is_mxe_file(swap_path):
+                os.makedirs(output_path, exist_ok=True)
+                print(f"Swapping {swap_path}...")
+                swap_mxe_file(swap_path, output_path)
+                print("Done.")
+                sys.exit()
+            else:
+                print(f"{swap_path} is not an MXE file.")
+                sys.exit(2)
+    elif verify_path is not None:
+        if base_path is None:
+            print("Verifying requires the original MXE to be given with -b/--base.")
+            sys.exit(2)
+        if recursive:
+            files = sorted([f for f in os.listdir(verify_path) if is_mxe_file(os.path.join(verify_path, f)) and is_mxe_file(os.path.join(base_path, f))])
+            if not len(files):
+                print(f"No MXE files in {verify_path} have an MXE of the same name in {base_path}.")
+                sys.exit(2)
+            n_matching = sum([verify_mxe_file(os.path.join(verify_path, file), os.path.join(base_path, file)) for file in files])
+            print(f"{n_matching}/{len(files)} files have equivalent relocation tables.")
+            sys.exit(0 if n_matching == len(files) else 1)
+        else:
+            if is_mxe_file(verify_path) and is_mxe_file(base_path):
+                if verify_mxe_file(verify_path, base_path):
+                    print("Relocation tables are equivalent.")
+                    sys.exit()
+                sys.exit(1)
+            else:
+                print(f"{verify_path} and {base_path} must both be MXE files.")
+                sys.exit(2)
     else:
-        print("Did not find a -u/--unpack or -p/--pack argument.")
+        print("Did not find a -u/--unpack, -p/--pack, -s/--swap, or -v/--verify argument.")
         print(usage_string)
         sys.exit(2)
 
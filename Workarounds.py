@@ -1,6 +1,7 @@
 import os
 
 from pyValkLib.containers.MXEN.MXEC.ParameterEntry import param_structs
+from pyValkLib.containers.MXEN.MXEC.MXECInterface import clear_layout_schema_hash
 
 def is_game_info_sys_param(filename):
     return os.path.splitext(os.path.split(filename)[1])[0] == "game_info_sys_param"
@@ -13,6 +14,7 @@ def hack_fix_game_info_sys_param(filename):
             for pname, ptype in param_chunk.items():
                 if ptype[1:] == "utf8_string":
                     param_chunk[pname] = ptype[0] + "sjis_string"
+        clear_layout_schema_hash()
 
 def hack_unfix_game_info_sys_param(filename):
     if is_game_info_sys_param(filename):
@@ -21,3 +23,4 @@ def hack_unfix_game_info_sys_param(filename):
             for pname, ptype in param_chunk.items():
                 if ptype[1:] == "sjis_string":
                     param_chunk[pname] = ptype[0] + "utf8_string"
+        clear_layout_schema_hash()
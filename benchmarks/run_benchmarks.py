@@ -0,0 +1,134 @@
+import getopt
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+from pyValkLib import MXE
+from pyValkLib.containers.MXEN.MXEC.MXECInterface import MXECInterface
+
+from CSVExtract import interface_to_csvs
+from CSVPack import csvs_to_interface
+
+from benchmarks.synthetic import build_synthetic_interface
+
+usage_string = "Usage (run from the repository root):\n" + \
+               "  python -m benchmarks.run_benchmarks [options]\n" + \
+               "  -h/--help     : Prints the help string.\n" + \
+               "  -s/--sizes    : Comma-separated entity counts to benchmark. Default: 20,200,1000.\n" + \
+               "  -n/--repeats  : Number of timed repeats per stage; the fastest is kept. Default: 3.\n" + \
+               "  -o/--out      : Writes the results to this JSON file.\n" + \
+               "  -b/--baseline : Compares the results against this JSON file.\n" + \
+               "  -t/--tolerance: Allowed slowdown relative to the baseline. Default: 0.2 (20%)."
+
+stages = ["read", "from_subreader", "interface_to_csvs", "csvs_to_interface", "to_subreader", "write"]
+
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def read_binary(data):
+    mxe = MXE()
+    mxe.read(data)
+    return mxe
+
+def to_subreader(mi):
+    return MXE.init_from_mxecinterface(mi)
+
+def benchmark_size(n_entities, repeats, seed=0):
+    data = MXE.init_from_mxecinterface(build_synthetic_interface(n_entities, seed)).write()
+    timings = {stage: float("inf") for stage in stages}
+    workdir = tempfile.mkdtemp()
+    try:
+        for _ in range(repeats):
+            stage_times = {}
+            mxe,         stage_times["read"]              = time_call(read_binary, data)
+            mi,          stage_times["from_subreader"]    = time_call(MXECInterface.from_subreader, mxe.MXEN.MXEC)
+            _,           stage_times["interface_to_csvs"] = time_call(interface_to_csvs, workdir, mi, "benchmark")
+            mi,          stage_times["csvs_to_interface"] = time_call(csvs_to_interface, os.path.join(workdir, "benchmark"))
+            mxe,         stage_times["to_subreader"]      = time_call(to_subreader, mi)
+            _,           stage_times["write"]             = time_call(mxe.write)
+            for stage, elapsed in stage_times.items():
+                timings[stage] = min(timings[stage], elapsed)
+            shutil.rmtree(os.path.join(workdir, "benchmark"))
+    finally:
+        shutil.rmtree(workdir)
+    return {"file_size": len(data), "timings": timings}
+
+def run_benchmarks(sizes, repeats):
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeats": repeats,
+        "results": {str(n_entities): benchmark_size(n_entities, repeats) for n_entities in sizes}
+    }
+
+def compare_to_baseline(results, baseline, tolerance):
+    regressions = []
+    for size, result in results["results"].items():
+        if size not in baseline["results"]:
+            continue
+        baseline_timings = baseline["results"][size]["timings"]
+        for stage, elapsed in result["timings"].items():
+            reference = baseline_timings.get(stage)
+            if reference is not None and elapsed > reference * (1 + tolerance):
+                regressions.append((size, stage, reference, elapsed))
+    return regressions
+
+def print_results(results):
+    print(f"{'Entities':>8} {'Size':>10} " + " ".join(f"{stage:>18}" for stage in stages))
+    for size, result in results["results"].items():
+        print(f"{size:>8} {result['file_size']:>10} " + " ".join(f"{result['timings'][stage]:>17.4f}s" for stage in stages))
+
+def main(argv):
+    try:
+        opts, args = getopt.getopt(argv, "hs:n:o:b:t:", ["help", "sizes=", "repeats=", "out=", "baseline=", "tolerance="])
+    except getopt.GetoptError:
+        print("Arg parsing error.")
+        print(usage_string)
+        sys.exit(2)
+
+    sizes = [20, 200, 1000]
+    repeats = 3
+    output_path = None
+    baseline_path = None
+    tolerance = 0.2
+    for opt, arg in opts:
+        if opt in ("-h", "--help"):
+            print(usage_string)
+            sys.exit()
+        elif opt in ("-s", "--sizes"):
+            sizes = [int(size) for size in arg.split(",")]
+        elif opt in ("-n", "--repeats"):
+            repeats = int(arg)
+        elif opt in ("-o", "--out"):
+            output_path = arg
+        elif opt in ("-b", "--baseline"):
+            baseline_path = arg
+        elif opt in ("-t", "--tolerance"):
+            tolerance = float(arg)
+
+    results = run_benchmarks(sizes, repeats)
+    print_results(results)
+
+    if output_path is not None:
+        with open(output_path, 'w') as F:
+            json.dump(results, F, indent=2)
+
+    if baseline_path is not None:
+        with open(baseline_path, 'r') as F:
+            baseline = json.load(F)
+        regressions = compare_to_baseline(results, baseline, tolerance)
+        for size, stage, reference, elapsed in regressions:
+            print(f"REGRESSION: [{size} entities] {stage}: {reference:.4f}s -> {elapsed:.4f}s ({elapsed/reference - 1:+.0%})")
+        if len(regressions):
+            sys.exit(1)
+        print("No regressions against the baseline.")
+
+if __name__ == "__main__":
+   main(sys.argv[1:])
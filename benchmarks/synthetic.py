@@ -0,0 +1,131 @@
+import random
+
+from pyValkLib.containers.MXEN.MXEC.MXECInterface import MXECInterface, ParameterInterface, EntityInterface
+from pyValkLib.containers.MXEN.MXEC.MXECInterface import GraphInterface, SubgraphInterface
+from pyValkLib.containers.MXEN.MXEC.MXECInterface import NodeInterface, EdgeInterface
+from pyValkLib.containers.MXEN.MXEC.MXECInterface import AssetInterface
+from pyValkLib.containers.MXEN.MXEC.MXECInterface import entity_structs
+
+
+int_types   = {"int8", "uint8", "int16", "uint16", "int32", "uint32", "int64", "uint64"}
+float_types = {"float16", "float32", "float64"}
+strings     = ["", "abc", "テスト文字列", "name_{}"]
+
+
+# Asset members get an ("asset", extension) placeholder until all assets
+# are known
+def fill_parameters(pi, rng, allow_assets):
+    type_def = pi.get_type_def()
+    for chunk in type_def.get("struct", []):
+        for k, ktype in chunk.items():
+            typecode = ktype[1:]
+            if typecode[:3] == "pad":
+                continue
+            elif typecode in ("int8", "uint8"):
+                value = rng.randrange(0, 100)
+            elif typecode in int_types:
+                value = rng.randrange(0, 30000)
+            elif typecode in float_types:
+                value = rng.choice([0., 1.5, -2.25, 100.])
+            elif typecode[:3] == "hex":
+                value = "0x0000000a"
+            elif typecode == "path":
+                value = -1
+            elif typecode == "asset":
+                value = -1
+                ext = type_def.get("assets", {}).get(k, "???")
+                if allow_assets and ext in AssetInterface.asset_defs and rng.random() < 0.5:
+                    value = ("asset", ext)
+            elif typecode == "pointer32":
+                value = 0
+            elif typecode in ("utf8_string", "sjis_string"):
+                value = rng.choice(strings).format(rng.randrange(50))
+            elif typecode == "color32":
+                value = [1, 2, 3, 4]
+            elif typecode == "color128":
+                value = [0.5, 0.25, 1., 0.]
+            else:
+                raise ValueError(f"Cannot generate a value for datatype '{typecode}'.")
+            pi.parameters[k] = value
+
+
+def build_synthetic_interface(n_entities, seed=0):
+    rng = random.Random(seed)
+    mi = MXECInterface()
+    param_sets = []
+
+    def new_parameter_set(param_type):
+        pi = ParameterInterface.init_from_type(param_type)
+        pi.ID = len(param_sets)
+        pi.name = f"{param_type}_{pi.ID}"
+        fill_parameters(pi, rng, True)
+        for subparam_name, subparam_def in pi.get_type_def().get("subparams", {}).items():
+            for _ in range(2):
+                spi = ParameterInterface.init_from_type(subparam_def["type"])
+                fill_parameters(spi, rng, False)
+                pi.subparameters[subparam_name].append(spi)
+        param_sets.append(pi)
+        return pi
+
+    # Entities
+    entity_types = sorted(entity_structs)
+    entities = []
+    for i in range(n_entities):
+        ei = EntityInterface.init_from_type(entity_types[i % len(entity_types)])
+        ei.ID = i
+        ei.name = f"エンティティ_{i}"
+        ei.controller_id = 0
+        ei.unknown = (i * 7919) if i % 5 == 0 else None
+        for subentity in ei.all_flat_entities():
+            for param_ref in subentity.parameters:
+                param_ref.param_id = new_parameter_set(param_ref.type).ID
+        entities.append(ei)
+
+    # Parameter set with subparameters
+    new_parameter_set("MxParameterStaticLight")
+
+    # Path graph
+    path_graphs = []
+    search_lights = [pi for pi in param_sets if pi.param_type == "SlgEnSearchLightParam"]
+    if len(search_lights):
+        search_lights[0].parameters["path_id"] = 0
+        edge_param = new_parameter_set("void")
+
+        graph = GraphInterface()
+        graph.name = "パス_0"
+        graph.node_type = "SlgEnSearchLightPathNodeParam"
+        subgraph = SubgraphInterface()
+        node_params = [new_parameter_set(graph.node_type) for _ in range(4)]
+        for j, node_param in enumerate(node_params):
+            ni = NodeInterface()
+            ni.param_id = node_param.ID
+            if j + 1 < len(node_params):
+                edge = EdgeInterface()
+                edge.next_node = j + 1
+                edge.param_ids = [edge_param.ID]
+                ni.next_edges.append(edge)
+            subgraph.nodes.append(ni)
+        graph.subgraphs.append(subgraph)
+        path_graphs.append(graph)
+
+    # Assets
+    assets = {}
+    for pi in param_sets:
+        for k, value in pi.parameters.items():
+            if type(value) is tuple:
+                ext = value[1]
+                if ext not in assets:
+                    ai = AssetInterface()
+                    ai.ID = len(assets)
+                    ai.asset_type, file_ext = AssetInterface.asset_defs[ext]
+                    ai.filepath = f"../resource/mx/asset{ai.ID}.{file_ext}"
+                    ai.unknown_id_1 = -1
+                    ai.unknown_id_2 = -1
+                    assets[ext] = ai
+                pi.parameters[k] = assets[ext].ID
+
+    mi.param_sets  = param_sets
+    mi.entities    = sorted(entities, key=lambda ei: (ei.entity.type, ei.ID))
+    mi.path_graphs = path_graphs
+    mi.assets      = sorted(assets.values(), key=lambda ai: ai.ID)
+    return mi
@@ -1 +1,3 @@
 from pyValkLib.filetypes.MXE import MXE
+from pyValkLib.filetypes.LazyMXE import LazyMXE
+from pyValkLib.filetypes.RawMXE import RawMXE
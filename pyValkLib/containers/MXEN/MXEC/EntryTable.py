@@ -1,7 +1,11 @@
 from pyValkLib.serialisation.Serializable import Serializable
 from pyValkLib.serialisation.PointerIndexableArray import PointerIndexableArray
+from pyValkLib.serialisation.Utils import split_cstr_bank, get_banked_string
 
 class EntryTable(Serializable):
+    name_chunk_size = 0x40
+    max_name_gap    = 0x1000
+    
     def __init__(self, entry_cls, context):
         super().__init__(context)
         self.entry_cls = entry_cls
@@ -121,9 +125,11 @@ class EntryTable(Serializable):
         rw.rw_obj(self.entries)
 
     def rw_entries(self, rw):
+        if rw.mode() == "read":
+            struct_types = self.read_struct_types(rw, [entry.name_offset for entry in self.entries.data])
         for entry in sorted([entry for entry in self.entries.data], key=lambda x: x.data_offset):
             if rw.mode() == "read":
-                component_type = self.check_struct_type(rw, entry.name_offset)
+                component_type = struct_types[entry.name_offset]
                 entry.parameter_type = component_type
             else:
                 component_type = entry.parameter_type
@@ -133,11 +139,43 @@ class EntryTable(Serializable):
                 
             rw.rw_obj_method(entry, entry.rw_data, component_type)
                 
-    def check_struct_type(self, rw, offset, prnt=False):
+    def read_struct_types(self, rw, offsets):
+        offsets = sorted(set(offsets))
+        if not len(offsets):
+            return {}
+        
+        # Names further apart than max_name_gap are read as separate spans, so
+        # that one stray offset cannot pull the rest of the file into memory
+        spans = [[offsets[0]]]
+        for offset in offsets[1:]:
+            if offset - spans[-1][-1] > self.max_name_gap:
+                spans.append([])
+            spans[-1].append(offset)
+        
         curr_offset = rw.local_tell()
-        rw.local_seek(offset)
-        lookup_type = rw.rw_cstr(None, "cp932")
-        lookup_type = lookup_type.split(':')[0]
-        lookup_type = lookup_type.split('@')[-1]
+        struct_types = {}
+        for span in spans:
+            name_bank = split_cstr_bank(self.read_name_span(rw, span[0], span[-1]), span[0])
+            name_offsets = list(name_bank)
+            for offset in span:
+                lookup_type = get_banked_string(name_bank, name_offsets, offset).decode("cp932")
+                lookup_type = lookup_type.split(':')[0]
+                lookup_type = lookup_type.split('@')[-1]
+                struct_types[offset] = lookup_type
         rw.local_seek(curr_offset)
-        return lookup_type
+        return struct_types
+    
+    def read_name_span(self, rw, first, last):
+        rw.local_seek(first)
+        # Read up to the last name, then on until its terminator
+        blob = rw.rw_bytes(None, last - first)
+        tail_start = len(blob)
+        while True:
+            chunk = rw.rw_bytes(None, self.name_chunk_size)
+            blob += chunk
+            if len(chunk) < self.name_chunk_size or chunk.find(b"\x00") != -1:
+                break
+        end = blob.find(b"\x00", tail_start)
+        if end != -1:
+            blob = blob[:end]
+        return blob
@@ -1,15 +1,17 @@
 import os
 import json
 import struct
+import hashlib
 
-from .MXECReadWriter import MXECReadWriter
+from .MXECReadWriter import MXECReadWriter, sjis_encodings, utf8_encodings
 from .ParameterEntry import param_structs
 from .ECSEntityEntry import EntityEntry, EntityData, EntitySubEntry
 from .PathingEntry import PathNode, PathEdge, SubGraph, PathingEntry
-from pyValkLib.serialisation.ReadWriter import OffsetTracker, POF0Builder, ENRSBuilder, CCRSBuilder
+from pyValkLib.serialisation.ReadWriter import OffsetTracker
+from pyValkLib.serialisation.StringPool import string_pool
 from pyValkLib.containers.POF0.POF0ReadWriter import compressPOF0
-from pyValkLib.containers.ENRS.ENRSCompression import compressENRS, toENRSPackedRep
-from pyValkLib.containers.CCRS.CCRSCompression import compressCCRS, toCCRSPackedRep
+from pyValkLib.containers.ENRS.ENRSCompression import compressENRS, toENRSRuns
+from pyValkLib.containers.CCRS.CCRSCompression import compressCCRS, toCCRSRuns
 
 
 entity_structs = {}
@@ -243,7 +245,7 @@ class MXECInterface:
             #assert param_set.ID == i, f"{param_set.ID} {i}"
             pi = cls.generate_param_interface(mxec_rw, param_set.data)
             str_name = mxec_rw.sjis_strings.at_ptr(param_set.name_offset).split(':')
-            pi.name = str_name[-1]
+            pi.name = string_pool.intern(str_name[-1])
             pi.ID = param_set.ID
             pi.param_type = param_set.data.struct_type
             
@@ -350,7 +352,7 @@ class MXECInterface:
             file_name   = mxec_rw.sjis_strings.at_ptr(asset_entry.file_name_ptr)
             
             ai.ID = asset_entry.ID
-            ai.filepath = folder_name + "/" + file_name
+            ai.filepath = string_pool.intern(folder_name + "/" + file_name)
             ai.asset_type = asset_entry.filetype
             ai.unknown_id_1 = asset_entry.unknown_0x14
             ai.unknown_id_2 = asset_entry.unknown_0x24
@@ -359,7 +361,8 @@ class MXECInterface:
             
         return instance
 
-    def to_subreader(self, depth):
+    def to_subreader(self, depth, profiler=None, relocation_cache=None):
+        mark_pass = profiler.mark if profiler is not None else lambda name: None
         ot = OffsetTracker()
         mxec_rw = MXECReadWriter(endianness=">")
         
@@ -370,14 +373,12 @@ class MXECInterface:
         utf8_string_lookup = dict()
         unknowns_lookup    = dict()
         
-        # Execute this in FIVE passes:
+        # Execute this in THREE passes:
         # 1) First, construct the data structures you need,
         #    find the offsets of major sections,
         #    and fill in offsets of major sections
         # 2) Next, actually fill in the main data in those structures
-        # 3) Collect POF0 data
-        # 4) Collect ENRS data
-        # 5) Collect CCRS data
+        # 3) Collect POF0, ENRS, and CCRS data in a single traversal
         
         ######################################################################
         #                               PASS 1                               #
@@ -386,6 +387,7 @@ class MXECInterface:
         # Would it not be better to include offset-linkage automatically inside
         # the read/write function definition?
         # -> Would then allow to you run read/write in another mode: Offset-generator
+        mark_pass("to_subreader.pass1_layout")
         mxec_rw.header.read_write(ot)
         mxec_rw.rw_fileinfo(ot)
         
@@ -719,19 +721,16 @@ class MXECInterface:
         
         # Do Strings
         for i, string_val in enumerate(sorted(sjis_strings)):
-            str_bytes = string_val.encode("cp932")
+            str_bytes = string_pool.encode_cstr(string_val, sjis_encodings)
             offset = ot.tell()
             sjis_string_lookup[string_val] = offset
-            ot.seek(offset + len(str_bytes) + 1)
+            ot.seek(offset + len(str_bytes))
         ot.align(ot.tell(), 0x10)
         for i, string_val in enumerate(sorted(utf8_strings)):
-            try:
-                str_bytes = string_val.encode("cp932")
-            except Exception:
-                str_bytes = string_val.encode("utf8")
+            str_bytes = string_pool.encode_cstr(string_val, utf8_encodings)
             offset = ot.tell()
             utf8_string_lookup[string_val] = offset
-            ot.seek(offset + len(str_bytes) + 1)
+            ot.seek(offset + len(str_bytes))
         ot.align(ot.tell(), 0x10)
         
         # Do Unknowns
@@ -755,6 +754,7 @@ class MXECInterface:
         #                               PASS 2                               #
         ######################################################################
         # Fill in data
+        mark_pass("to_subreader.pass2_fill")
         
         # Fill in Parameter Sets
         def fill_param_strings(prw_data, param_set, sjis_lookup, utf8_lookup):
@@ -816,35 +816,39 @@ class MXECInterface:
             
         # Strings
         for string_val, offset in sjis_string_lookup.items():
-            idx = len(mxec_rw.sjis_strings)
-            mxec_rw.sjis_strings.data.append(string_val)
-            mxec_rw.sjis_strings.ptr_to_idx[offset] = idx
-            mxec_rw.sjis_strings.idx_to_ptr[idx] = offset
+            mxec_rw.sjis_strings.append(string_val, offset)
         for string_val, offset in utf8_string_lookup.items():
-            idx = len(mxec_rw.utf8_strings)
-            mxec_rw.utf8_strings.data.append(string_val)
-            mxec_rw.utf8_strings.ptr_to_idx[offset] = idx
-            mxec_rw.utf8_strings.idx_to_ptr[idx] = offset
+            mxec_rw.utf8_strings.append(string_val, offset)
         
         # Unknowns
         for unknown, offset in unknowns_lookup.items():
-            idx = len(mxec_rw.unknowns)
-            mxec_rw.unknowns.data.append(unknown)
-            mxec_rw.unknowns.ptr_to_idx[offset] = idx
-            mxec_rw.unknowns.idx_to_ptr[idx] = offset
+            mxec_rw.unknowns.append(unknown, offset)
             
         
         ######################################################################
         #                               PASS 3                               #
         ######################################################################
-        # POF0
-        
-        # Create POF0 data
-        pb = POF0Builder()
-        pb.virtual_offset = mxec_rw.header.header_length
-        mxec_rw.read_write_contents(pb)
+        # Collect the relocation data for POF0, ENRS, and CCRS at once
+        mark_pass("to_subreader.pass3_relocations")
+        cached = None
+        if relocation_cache is not None:
+            layout_key = get_layout_fingerprint(mxec_rw)
+            cached = relocation_cache.get(layout_key)
+        
+        if cached is None:
+            rb = mxec_rw.buildRelocations()
+            
+            pb_data = compressPOF0(rb.pof0_pointers)
+            eb_num_groups = len(rb.enrs.pointers)
+            eb_data = compressENRS(toENRSRuns(rb.enrs.pointers))
+            cb_num_groups = len(rb.ccrs.pointers)
+            cb_data = compressCCRS(toCCRSRuns(rb.ccrs.pointers))
+            if relocation_cache is not None:
+                relocation_cache.put(layout_key, pb_data, eb_num_groups, eb_data, cb_num_groups, cb_data)
+        else:
+            pb_data, eb_num_groups, eb_data, cb_num_groups, cb_data = cached
         
-        pb_data = compressPOF0(pb.pointers)
+        # POF0
         mxec_rw.POF0.data_size = len(pb_data) + 4
         mxec_rw.POF0.data = pb_data
         
@@ -859,18 +863,8 @@ class MXECInterface:
         
         mxec_rw.POF0.read_write(ot)
         
-        ######################################################################
-        #                               PASS 4                               #
-        ######################################################################
         # ENRS
-        # Create POF0 data
-        eb = ENRSBuilder(mxec_rw.context.endianness)
-        eb.anchor_pos = -mxec_rw.header.header_length
-        mxec_rw.read_write_contents(eb)
-        
-        eb_rawdata = toENRSPackedRep(eb.pointers)
-        eb_data = compressENRS(eb_rawdata)
-        mxec_rw.ENRS.num_groups = len(eb.pointers)
+        mxec_rw.ENRS.num_groups = eb_num_groups
         mxec_rw.ENRS.data = eb_data
         
         # Create ENRS header data
@@ -882,17 +876,8 @@ class MXECInterface:
         
         mxec_rw.ENRS.read_write(ot)
         
-        ######################################################################
-        #                               PASS 5                               #
-        ######################################################################
         # CCRS
-        cb = CCRSBuilder()
-        cb.anchor_pos = -mxec_rw.header.header_length
-        mxec_rw.read_write_contents(cb)
-        
-        cb_rawdata = toCCRSPackedRep(cb.pointers)
-        cb_data = compressCCRS(cb_rawdata)
-        mxec_rw.CCRS.num_groups = len(cb.pointers)
+        mxec_rw.CCRS.num_groups = cb_num_groups
         mxec_rw.CCRS.data = cb_data
         
         # Create CCRS header data
@@ -914,5 +899,57 @@ class MXECInterface:
         mxec_rw.EOFC.header.contents_length = 0
         
         mxec_rw.header.contents_length = ot.tell()
+        mark_pass(None)
         
         return mxec_rw
+
+
+# Changes to the schemas change the layout of otherwise-identical MXECs. The
+# hash is computed once, so anything that edits the schemas at runtime, as
+# the game_info_sys_param workaround does, must call clear_layout_schema_hash
+layout_schema_hash = None
+def get_layout_schema_hash():
+    global layout_schema_hash
+    if layout_schema_hash is None:
+        layout_schema_hash = hashlib.sha256(json.dumps([param_structs, entity_structs], sort_keys=True).encode()).hexdigest()
+    return layout_schema_hash
+
+def clear_layout_schema_hash():
+    global layout_schema_hash
+    layout_schema_hash = None
+
+# Covers everything that moves pointers and big-endian fields; parameter
+# values and string contents do not affect the relocation tables
+def get_layout_fingerprint(mxec_rw):
+    def param_shape(param_set):
+        return (param_set.struct_type, tuple((name, tuple(param_shape(subparam) for subparam in subparams))
+                                             for name, subparams in param_set.subparams.items()))
+
+    layout = (
+        get_layout_schema_hash(),
+        mxec_rw.header.data_length,
+        mxec_rw.content_flags,
+        mxec_rw.parameter_sets_table_ptr,
+        mxec_rw.entity_table_ptr,
+        mxec_rw.asset_table_ptr,
+        mxec_rw.pathing_table_ptr,
+        mxec_rw.texmerge_count,
+        mxec_rw.texmerge_ptrs_ptr,
+        mxec_rw.pvs_record_ptr,
+        mxec_rw.mergefile_record_ptr,
+        tuple((prw.data_offset, param_shape(prw.data)) for prw in mxec_rw.parameter_sets_table.entries),
+        tuple((entity_rw.data_offset, entity_rw.has_unknown_data, tuple(dec_rw.count for dec_rw in entity_rw.data.subentries))
+              for entity_rw in mxec_rw.entity_table.entries),
+        tuple((path_rw.node_count, path_rw.edge_count, path_rw.subgraphs_count, path_rw.unused_node_count,
+               tuple((node_rw.next_edge_count, node_rw.prev_edge_count) for node_rw in path_rw.graph_nodes),
+               tuple(edge_rw.param_count for edge_rw in path_rw.graph_edges),
+               tuple((subgraph_rw.node_count, subgraph_rw.edge_count, subgraph_rw.start_node_count, subgraph_rw.end_node_count)
+                     for subgraph_rw in path_rw.subgraphs))
+              for path_rw in mxec_rw.pathing_table.entries),
+        len(mxec_rw.asset_table.entries),
+        len(mxec_rw.asset_table.asset_slot_offsets),
+        mxec_rw.sjis_strings.offsets.tobytes(),
+        mxec_rw.utf8_strings.offsets.tobytes(),
+        mxec_rw.unknowns.offsets.tobytes()
+    )
+    return hashlib.sha256(repr(layout).encode()).hexdigest()
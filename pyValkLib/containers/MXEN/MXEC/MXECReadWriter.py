@@ -1,5 +1,6 @@
-from pyValkLib.serialisation.Serializable import Context
 from pyValkLib.serialisation.ValkSerializable import ValkSerializable32BH
+from pyValkLib.serialisation.Utils import split_cstr_bank, get_banked_string
+from pyValkLib.serialisation.StringPool import string_pool, decode_first_fit
 from pyValkLib.serialisation.PointerIndexableArray import PointerIndexableArray, PointerIndexableArrayCStr, PointerIndexableArrayUint64
 from pyValkLib.containers.MXEN.MXEC.EntryTable import EntryTable 
 from pyValkLib.containers.MXEN.MXEC.ParameterEntry import ParameterEntry
@@ -50,8 +51,6 @@ class MXECReadWriter(ValkSerializable32BH):
         self.utf8_strings = PointerIndexableArrayCStr(self.context, "utf8")
         self.unknowns = PointerIndexableArrayUint64(self.context)
 
-        subcontainer_context = Context()
-        subcontainer_context.endianness = '<'
         self.POF0 = POF0ReadWriter({}, '<')
         self.ENRS = ENRSReadWriter({}, '<')
         self.CCRS = CCRSReadWriter({}, '<')
@@ -71,13 +70,13 @@ class MXECReadWriter(ValkSerializable32BH):
     
     def read_write_contents(self, rw):
         rw.assert_equal(self.header.flags, 0x18000000, lambda x: hex(x))
-        self.rw_fileinfo(rw)
-        self.rw_parameter_sets_table(rw)
-        self.rw_entities_table(rw)
-        self.rw_pathing_table(rw)
-        self.rw_asset_table(rw)
-        self.rw_strings(rw)
-        self.rw_unknowns(rw)
+        rw.rw_section("MXEC.fileinfo",             self.rw_fileinfo)
+        rw.rw_section("MXEC.parameter_sets_table", self.rw_parameter_sets_table)
+        rw.rw_section("MXEC.entity_table",         self.rw_entities_table)
+        rw.rw_section("MXEC.pathing_table",        self.rw_pathing_table)
+        rw.rw_section("MXEC.asset_table",          self.rw_asset_table)
+        rw.rw_section("MXEC.strings",              self.rw_strings)
+        rw.rw_section("MXEC.unknowns",             self.rw_unknowns)
         
         rw.mark_new_contents_array()
         
@@ -195,74 +194,17 @@ class MXECReadWriter(ValkSerializable32BH):
         rw.align(rw.local_tell(), 0x10)
         
     def read_strings(self, rw):
-        # # Instead of reading/writing blobs, might make sense to collect a list
-        # # of string pointers during the read/write and then make those read/writes.
-        # # You would of course have to keep separate lists for UTF-8 and SHIFT-JIS strings.
-        # curpos = rw.local_tell()
-        # start_pos = rw.local_tell()
-
-        # # Get the start of the unknown data
-        # entity_data_offsets = [elem.unknown_data_ptr for elem in self.entity_table.entries.data if elem.unknown_data_ptr > 0]
-        # end_point = min(entity_data_offsets) if len(entity_data_offsets) else self.header.header_length + self.header.data_length
-
-
-        # # Get the start of the UTF-8 strings
-        # utf8_string_offsets = [elem.data.get_string_ptrs() for elem in self.parameter_sets_table.entries]
-        # utf8_string_offsets = [subitem for item in utf8_string_offsets for subitem in item]
-        
-        # start_of_utf8_strings = min(utf8_string_offsets) if len(utf8_string_offsets) else end_point
-
-        # main_string_blob      = memoryview(rw.bytestream.read(start_of_utf8_strings - start_pos))
-
-        # n_entries = 0
-        # first_string = True
-        # while curpos < start_of_utf8_strings:
-        #     strn, size = parse_null_terminated_string(main_string_blob[curpos-start_pos:])
-        #     self.sjis_strings.data.append(strn)
-        #     self.sjis_strings.ptr_to_idx[curpos] = n_entries
-        #     self.sjis_strings.idx_to_ptr[n_entries] = curpos
-        #     n_entries += 1
-        #     curpos += size
-        #     first_string = False
-
-        # remaining_stuff = main_string_blob[curpos-start_pos:].tobytes()
-        # if remaining_stuff != (b'\x00'*len(remaining_stuff)):
-        #     print(remaining_stuff)
-        #     raise Exception(f"End of SHIFT-JIS String Bank not reached!\n{remaining_stuff}")
-        # rw.align(rw.local_tell(), 0x10) # Will already be aligned since we've read an aligned blob
-        # curpos = rw.local_tell()
-
-        # rw.assert_local_file_pointer_now_at("Start of UTF-8 String Bank", start_of_utf8_strings)
-        # utf8_string_blob = memoryview(rw.bytestream.read(end_point - start_of_utf8_strings))
-        # n_entries = 0
-        # first_string = True
-        # while curpos < end_point:
-        #     strn, size = parse_null_terminated_string_utf8(utf8_string_blob[curpos-start_of_utf8_strings:])
-        #     self.utf8_strings.data.append(strn)
-        #     self.utf8_strings.ptr_to_idx[curpos] = n_entries
-        #     self.utf8_strings.idx_to_ptr[n_entries] = curpos
-        #     n_entries += 1
-        #     curpos += size
-        #     first_string = False
-
-        # remaining_stuff = utf8_string_blob[curpos-start_of_utf8_strings:].tobytes()
-        # if remaining_stuff != (b'\x00'*len(remaining_stuff)):
-        #     print(remaining_stuff)
-        #     raise Exception("End of UTF-8 String Bank not reached!")
-        # rw.align(rw.local_tell(), 0x10) # Will already be aligned since we've read an aligned blob
-        # rw.assert_local_file_pointer_now_at("End of UTF-8 String Bank", end_point)
-        
-        
-        ######
-        
-        # Get all SJIS string offsets
+        # Get all string offsets. UTF8 only lives in the parameter sets
         all_sjis_string_ptrs = set()
+        all_utf8_string_ptrs = set()
         for elem in self.parameter_sets_table.entries:
             all_sjis_string_ptrs.add(elem.name_offset)
-            all_sjis_string_ptrs.update(set(elem.data.get_shiftjis_string_ptrs()))
+            param_datas = [elem.data]
             for subparams in elem.data.subparams.values():
-                for subparam in subparams:
-                    all_sjis_string_ptrs.update(set(subparam.get_shiftjis_string_ptrs()))
+                param_datas.extend(subparams)
+            for param_data in param_datas:
+                all_sjis_string_ptrs.update(param_data.get_shiftjis_string_ptrs())
+                all_utf8_string_ptrs.update(param_data.get_string_ptrs())
         for entity in self.entity_table.entries:
             all_sjis_string_ptrs.add(entity.name_offset)
             for subentry in entity.data.subentries:
@@ -273,60 +215,43 @@ class MXECReadWriter(ValkSerializable32BH):
             all_sjis_string_ptrs.add(asset_entry.folder_name_ptr)
             all_sjis_string_ptrs.add(asset_entry.file_name_ptr)
         all_sjis_string_ptrs = sorted(all_sjis_string_ptrs)
-        
-        # UTF8 only lives in the parameter sets
-        all_utf8_string_ptrs = set()
-        for elem in self.parameter_sets_table.entries:
-            all_utf8_string_ptrs.update(set(elem.data.get_string_ptrs()))
-            for subparam in elem.data.subparams.values():
-                for subparam in subparams:
-                    all_utf8_string_ptrs.update(set(subparam.get_string_ptrs()))
         all_utf8_string_ptrs = sorted(all_utf8_string_ptrs)
         
         start_pos = rw.local_tell()
         entity_data_offsets = [elem.unknown_data_ptr for elem in self.entity_table.entries.data if elem.unknown_data_ptr > 0]
         end_point = min(entity_data_offsets) if len(entity_data_offsets) else self.header.header_length + self.header.data_length
-        string_blob = memoryview(rw.bytestream.read(end_point - start_pos))
+        string_blob = rw.rw_bytes(None, end_point - start_pos)
+        string_bank = split_cstr_bank(string_blob, start_pos)
+        string_offsets = list(string_bank)
         
         # In most files, the strings are arranged into a SJIS block and a
         # UTF8 block
         # However, there are many hexedited MXEs out there that violate this,
         # so we should try to account for that and ignore the real structure
-        n_sjis = 0
+        decoded = {}
         for sjis_string_ptr in all_sjis_string_ptrs:
-            strn, size = parse_null_terminated_string(string_blob[sjis_string_ptr-start_pos:])
-            self.sjis_strings.data.append(strn)
-            self.sjis_strings.ptr_to_idx[sjis_string_ptr] = n_sjis
-            self.sjis_strings.idx_to_ptr[n_sjis] = sjis_string_ptr
-            n_sjis += 1
+            strn = string_pool.decode(get_banked_string(string_bank, string_offsets, sjis_string_ptr), decode_sjis_string, decoded)
+            self.sjis_strings.append(strn, sjis_string_ptr)
             
-        n_utf8 = 0
         for utf8_string_ptr in all_utf8_string_ptrs:
-            strn, size = parse_null_terminated_string_utf8(string_blob[utf8_string_ptr-start_pos:])
-            self.utf8_strings.data.append(strn)
-            self.utf8_strings.ptr_to_idx[utf8_string_ptr] = n_utf8
-            self.utf8_strings.idx_to_ptr[n_utf8] = utf8_string_ptr
-            n_utf8 += 1
+            strn = string_pool.decode(get_banked_string(string_bank, string_offsets, utf8_string_ptr), decode_utf8_string, decoded)
+            self.utf8_strings.append(strn, utf8_string_ptr)
         
     def write_strings(self, rw):
         for string in self.sjis_strings:
-            rw.rw_cstr(string, encoding="cp932")
+            raw = string_pool.encode_cstr(string, sjis_encodings)
+            rw.rw_bytes(raw, len(raw))
         rw.align(rw.local_tell(), 0x10)
         for string in self.utf8_strings:
-            try:
-                rw.rw_cstr(string, encoding="cp932") # The game seemingly can only use SHIFT-JIS, despite containing UTF8-encoded strings...
-            except Exception:
-                rw.rw_cstr(string, encoding="utf8") # The game seemingly can only use SHIFT-JIS, despite containing UTF8-encoded strings...
+            raw = string_pool.encode_cstr(string, utf8_encodings)
+            rw.rw_bytes(raw, len(raw))
         rw.align(rw.local_tell(), 0x10)
         
     def read_unknowns(self, rw):
         entity_data_offsets = sorted(set([elem.unknown_data_ptr for elem in self.entity_table.entries.data if elem.unknown_data_ptr > 0]))
         for offset in entity_data_offsets:
             rw.assert_local_file_pointer_now_at("Unknowns Offset", offset)
-            idx =  len(self.unknowns.idx_to_ptr)
-            self.unknowns.ptr_to_idx[offset] = len(self.unknowns.idx_to_ptr)
-            self.unknowns.idx_to_ptr[idx] = offset
-            self.unknowns.data.append((struct.unpack('Q', rw.bytestream.read(8))[0]))
+            self.unknowns.append(struct.unpack('Q', rw.rw_bytes(None, 8))[0], offset)
 
     def write_unknowns(self, rw):
         for data in self.unknowns.data:
@@ -344,27 +269,20 @@ class MXECReadWriter(ValkSerializable32BH):
         rw.align(rw.local_tell(), 0x10)
         
 
-def parse_null_terminated_string(data):
-    size = 0
-    while data[size] != 0:
-        size += 1
+sjis_encodings = ("cp932",)
+# The game seemingly can only use SHIFT-JIS, despite containing UTF8-encoded strings...
+utf8_encodings = ("cp932", "utf8")
+
+def decode_sjis_string(raw):
     try:
-        string = data[0:size].tobytes().decode('cp932')
-    except Exception as e:
-        print(data[0:size].tobytes())
-        raise e
-    return string, size+1
+        string = raw.decode('cp932')
+    except UnicodeDecodeError as e:
+        raise ValueError(f"Cannot interpret string as SHIFT-JIS: {bytes(raw)}") from e
+    return string
 
-def parse_null_terminated_string_utf8(data):
-    size = 0
-    while data[size] != 0:
-        size += 1
+def decode_utf8_string(raw):
     try:
-        string = data[0:size].tobytes().decode('cp932')
-    except Exception:
-        try:
-            string = data[0:size].tobytes().decode('utf8')
-        except Exception as e:
-            print("Cannot interpret string as SHIFT-JIS or UTF8:", data[0:size].tobytes())
-            raise e
-    return string, size+1
+        string = decode_first_fit(raw, utf8_encodings)
+    except UnicodeDecodeError as e:
+        raise ValueError(f"Cannot interpret string as SHIFT-JIS or UTF8: {bytes(raw)}") from e
+    return string
@@ -1,5 +1,7 @@
+import array
 import json
 import os
+import struct
 from pyValkLib.serialisation.Serializable import Serializable
 
 
@@ -52,6 +54,149 @@ func_lookup = {
     "color128"   : lambda rw, x, en: rw.rw_color128(x, endianness=en)
 }
 
+# Struct typecodes for each parameter datatype
+codec_typecodes = {
+    "int8"       : "b",
+    "int16"      : "h",
+    "int32"      : "i",
+    "int64"      : "q",
+    "uint8"      : "B",
+    "uint16"     : "H",
+    "uint32"     : "I",
+    "uint64"     : "Q",
+    "hex8"       : "B",
+    "hex16"      : "H",
+    "hex32"      : "I",
+    "hex64"      : "Q",
+    "float16"    : "e",
+    "float32"    : "f",
+    "float64"    : "d",
+    "pad8"       : "B",
+    "pad16"      : "H",
+    "pad32"      : "I",
+    "pad64"      : "Q",
+    "path"       : "i",
+    "asset"      : "q",
+    "pointer32"  : "I",
+    "utf8_string": "I",
+    "sjis_string": "I",
+    "color32"    : "I",
+    "color128"   : "4f"
+}
+
+# Consecutive members with a shared endianness, packed with one struct.Struct
+class ParameterChunkCodec:
+    __slots__ = ("struct", "names", "pad_idxs", "is_plain", "fields")
+    
+    def __init__(self, endianness, fields):
+        self.struct = struct.Struct(endianness + "".join(codec_typecodes[typecode] for _, typecode in fields))
+        self.names = tuple(name for name, _ in fields)
+        self.fields = tuple(fields)
+        
+        # Positions of the padding members in the flat value tuple
+        pad_idxs = []
+        idx = 0
+        for _, typecode in fields:
+            if typecode[:3] == "pad":
+                pad_idxs.append(idx)
+            idx += 4 if typecode == "color128" else 1
+        self.pad_idxs = tuple(pad_idxs)
+        self.is_plain = all(typecode[:3] != "hex" and typecode[:5] != "color" for _, typecode in fields)
+        
+    def read(self, rw, data):
+        values = rw.rw_packed(self.struct, None)
+        for idx in self.pad_idxs:
+            rw.assert_is_zero(values[idx])
+        
+        if self.is_plain:
+            data.update(zip(self.names, values))
+        else:
+            idx = 0
+            for name, typecode in self.fields:
+                if typecode == "color128":
+                    data[name] = array.array('f', values[idx:idx+4])
+                    idx += 4
+                    continue
+                
+                value = values[idx]
+                if typecode == "color32":
+                    value = [(value >> 0x00) & 0xFF,
+                             (value >> 0x08) & 0xFF,
+                             (value >> 0x10) & 0xFF,
+                             (value >> 0x18) & 0xFF]
+                elif typecode[:3] == "hex":
+                    size = struct.calcsize(codec_typecodes[typecode])
+                    value = f'0x{{:0{size}x}}'.format(value)
+                data[name] = value
+                idx += 1
+                
+    def write(self, rw, data):
+        if self.is_plain:
+            values = [data[name] for name in self.names]
+        else:
+            values = []
+            for name, typecode in self.fields:
+                values.extend(encode_param_value(typecode, data[name]))
+        for idx in self.pad_idxs:
+            rw.assert_is_zero(values[idx])
+        rw.rw_packed(self.struct, values)
+        
+
+def encode_param_value(typecode, value):
+    if typecode == "color128":
+        return tuple(value)
+    elif typecode == "color32":
+        packed = 0
+        for val, offset in zip(value, [0x00, 0x08, 0x10, 0x18]):
+            packed |= (int(val) & 0xFF) << offset
+        return (packed,)
+    elif typecode[:3] == "hex" and type(value) is str:
+        return (int(value, 16),)
+    else:
+        return (value,)
+
+
+param_codecs = {}
+def get_param_codecs(struct_type):
+    codecs = param_codecs.get(struct_type)
+    if codecs is None:
+        codecs = []
+        for param_chunk in param_structs[struct_type]["struct"]:
+            chunk_codecs = []
+            run_endianness = None
+            run = []
+            for k, ktype in param_chunk.items():
+                endianness, typecode = ktype[0], ktype[1:]
+                if typecode not in codec_typecodes:
+                    raise Exception(f"Failed to compile {k} for {struct_type}: unknown datatype '{typecode}'.")
+                if endianness != run_endianness and len(run):
+                    chunk_codecs.append(ParameterChunkCodec(run_endianness, run))
+                    run = []
+                run_endianness = endianness
+                run.append((k, typecode))
+            if len(run):
+                chunk_codecs.append(ParameterChunkCodec(run_endianness, run))
+            codecs.append(chunk_codecs)
+        param_codecs[struct_type] = codecs
+    return codecs
+
+param_field_layouts = {}
+# Offsets are relative to the start of the ParameterSet
+def get_param_field_layout(struct_type):
+    layout = param_field_layouts.get(struct_type)
+    if layout is None:
+        fields = []
+        offset = 0
+        for param_chunk in param_structs[struct_type]["struct"]:
+            for k, ktype in param_chunk.items():
+                endianness, typecode = ktype[0], ktype[1:]
+                packer = struct.Struct(endianness + codec_typecodes[typecode])
+                fields.append((k, typecode, offset, packer))
+                offset += packer.size
+        layout = (tuple(fields), offset)
+        param_field_layouts[struct_type] = layout
+    return layout
+
 class ParameterSet(Serializable):
     def __init__(self, context, struct_type):
         super().__init__(context)
@@ -97,6 +242,11 @@ class ParameterSet(Serializable):
         self.data[k] = func_lookup[typecode](rw, self.data[k], endianness)
         
     def rw_struct(self, rw):
+        mode = rw.mode()
+        if mode == "read" or mode == "write":
+            self.rw_struct_compiled(rw, mode)
+            return
+        
         for param_chunk in self.struct_obj["struct"]:
             rw.mark_new_contents_array()
             rw.mark_new_contents_array_member()
@@ -109,6 +259,20 @@ class ParameterSet(Serializable):
                     print("Failed to handle", k, "for", self.struct_type)
                     raise e
                 
+    def rw_struct_compiled(self, rw, mode):
+        for chunk_codecs in get_param_codecs(self.struct_type):
+            rw.mark_new_contents_array()
+            rw.mark_new_contents_array_member()
+            
+            for codec in chunk_codecs:
+                try:
+                    if mode == "read":
+                        codec.read(rw, self.data)
+                    else:
+                        codec.write(rw, self.data)
+                except Exception as e:
+                    raise ValueError(f"Failed to handle {', '.join(codec.names)} for {self.struct_type}.") from e
+                
     def rw_subparams(self, rw):
         if rw.mode() == "read":
             self.init_subparams()
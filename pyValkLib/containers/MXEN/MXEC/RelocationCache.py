@@ -0,0 +1,92 @@
+import os
+import struct
+import tempfile
+
+
+# Recency is tracked through the modification times of the entry files, so
+# the cache can be shared between runs
+class RelocationCache:
+    __slots__ = ("directory", "max_entries", "hits", "misses")
+
+    magic = b"RLC0"
+    entry_header = struct.Struct("<4s5I")
+    extension = ".reloc"
+
+    def __init__(self, directory, max_entries=256):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def get_path(self, key):
+        return os.path.join(self.directory, key + self.extension)
+
+    def get(self, key):
+        path = self.get_path(key)
+        try:
+            with open(path, 'rb') as F:
+                data = F.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        # Entries that are truncated or otherwise damaged are dropped
+        if len(data) < self.entry_header.size:
+            return self.discard(path)
+        magic, pof0_size, enrs_num_groups, enrs_size, ccrs_num_groups, ccrs_size = self.entry_header.unpack_from(data)
+        if magic != self.magic or len(data) != self.entry_header.size + pof0_size + enrs_size + ccrs_size:
+            return self.discard(path)
+
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        self.hits += 1
+        pos = self.entry_header.size
+        pof0_data = data[pos:pos + pof0_size]
+        pos += pof0_size
+        enrs_data = data[pos:pos + enrs_size]
+        pos += enrs_size
+        ccrs_data = data[pos:pos + ccrs_size]
+        return pof0_data, enrs_num_groups, enrs_data, ccrs_num_groups, ccrs_data
+
+    def discard(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        self.misses += 1
+        return None
+
+    def put(self, key, pof0_data, enrs_num_groups, enrs_data, ccrs_num_groups, ccrs_data):
+        header = self.entry_header.pack(self.magic, len(pof0_data), enrs_num_groups, len(enrs_data), ccrs_num_groups, len(ccrs_data))
+
+        # Write to a temporary file first so that concurrent packs never
+        # see a partial entry
+        fd, temp_path = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as F:
+                F.write(header)
+                F.write(pof0_data)
+                F.write(enrs_data)
+                F.write(ccrs_data)
+            os.replace(temp_path, self.get_path(key))
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith(self.extension)]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def __repr__(self):
+        return f"Relocation Cache [{self.directory}]: {self.hits} hits, {self.misses} misses."
@@ -0,0 +1,84 @@
+from .ParameterEntry import get_param_field_layout, encode_param_value
+
+
+# Parameter members that can be overwritten in place without moving or
+# relocating anything else in the MXEC
+patchable_typecodes = {
+    "int8", "int16", "int32", "int64",
+    "uint8", "uint16", "uint32", "uint64",
+    "hex8", "hex16", "hex32", "hex64",
+    "float16", "float32", "float64",
+    "color32", "color128"
+}
+
+
+def get_interface_state(obj):
+    if isinstance(obj, (list, tuple)):
+        return tuple(get_interface_state(elem) for elem in obj)
+    elif isinstance(obj, dict):
+        return tuple((k, get_interface_state(v)) for k, v in obj.items())
+    elif hasattr(obj, "__dict__"):
+        return (type(obj).__name__, get_interface_state(vars(obj)))
+    else:
+        return obj
+
+def get_generated_members(struct_obj):
+    generated = set()
+    for subparam_def in struct_obj.get("subparams", {}).values():
+        generated.add(subparam_def["count"])
+        generated.add(subparam_def["pointer"])
+    return generated
+
+# Subparameter counts and pointers are regenerated when packing, so they are
+# left out
+def get_layout_state(param_set, param_type):
+    struct_obj = param_set.get_type_def(param_type)
+    generated = get_generated_members(struct_obj)
+    fields, _ = get_param_field_layout(param_type)
+    layout_values = []
+    for name, typecode, _, _ in fields:
+        if name in param_set.parameters and typecode not in patchable_typecodes and name not in generated:
+            layout_values.append((name, get_interface_state(param_set.parameters[name])))
+    subparam_defs = struct_obj.get("subparams", {})
+    return (param_set.ID, param_set.name, tuple(layout_values),
+            tuple((name, tuple(get_layout_state(subparam, subparam_defs[name]["type"]) for subparam in subparams))
+                  for name, subparams in param_set.subparameters.items()))
+
+def collect_param_patches(prw_data, offset, old_param_set, new_param_set, patches):
+    fields, size = get_param_field_layout(prw_data.struct_type)
+    generated = get_generated_members(prw_data.struct_obj)
+    for name, typecode, field_offset, packer in fields:
+        if typecode not in patchable_typecodes or name in generated:
+            continue
+        old_bytes = packer.pack(*encode_param_value(typecode, old_param_set.parameters[name]))
+        new_bytes = packer.pack(*encode_param_value(typecode, new_param_set.parameters[name]))
+        if old_bytes != new_bytes:
+            patches.append((offset + field_offset, new_bytes))
+
+    for subparam_name, subparam_def in prw_data.struct_obj.get("subparams", {}).items():
+        subparam_offset = prw_data.data[subparam_def["pointer"]]
+        for sub_prw_data, old_subparam, new_subparam in zip(prw_data.subparams[subparam_name],
+                                                            old_param_set.subparameters[subparam_name],
+                                                            new_param_set.subparameters[subparam_name]):
+            subparam_offset = collect_param_patches(sub_prw_data, subparam_offset, old_subparam, new_subparam, patches)
+    return offset + size
+
+# Returns None if anything other than fixed-width numeric, hex or colour
+# members changed
+def get_value_patches(mxec_rw, old_mi, new_mi):
+    if len(old_mi.param_sets) != len(new_mi.param_sets):
+        return None
+    for attr in ("entities", "path_graphs", "assets", "loose_nodes"):
+        if get_interface_state(getattr(old_mi, attr)) != get_interface_state(getattr(new_mi, attr)):
+            return None
+
+    patches = []
+    new_param_sets = {param_set.ID: param_set for param_set in new_mi.param_sets}
+    for prw, old_param_set in zip(mxec_rw.parameter_sets_table.entries, old_mi.param_sets):
+        new_param_set = new_param_sets.get(old_param_set.ID)
+        if new_param_set is None or old_param_set.param_type != new_param_set.param_type:
+            return None
+        if get_layout_state(old_param_set, old_param_set.param_type) != get_layout_state(new_param_set, new_param_set.param_type):
+            return None
+        collect_param_patches(prw.data, prw.data_offset, old_param_set, new_param_set, patches)
+    return patches
@@ -1,3 +1,8 @@
+import array
+import itertools
+import operator
+import re
+
 from pyValkLib.serialisation import Serializable
 from pyValkLib.serialisation.ValkSerializable import ValkSerializable32BH, Header32B
 
@@ -24,111 +29,43 @@ class POF0ReadWriter(ValkSerializable32BH):
         
 
 
-def decompressPOF0(POF0_data, num_offsets):
-    offset = 0
-    offsets = []  
-    data = iter(POF0_data)
-
-    bytes_to_parse = iter(range(num_offsets))
-    for loop in bytes_to_parse:
-        elem = next(data)
-        power_val = elem & 0xC0
-        value = elem & 0x3F
-        if power_val == 0x40:
-            offset += 4*value
-            offsets.append(offset)
-        elif power_val == 0x80:
-            offset_incr = 4*(value << 8 | next(data))
-            offset += offset_incr
-            next(bytes_to_parse)
-            offsets.append(offset)
-        elif power_val == 0xC0:
-            offset_incr = 4*(value << 0x18 | next(data) << 0x10 | next(data) << 0x08 | next(data))
-            offset += offset_incr
-            offsets.append(offset)
-            next(bytes_to_parse)
-            next(bytes_to_parse)
-            next(bytes_to_parse)
-        else:
-            continue
-    return offsets
-
-def decompressPOF0_alt(data):
-    offset = 0
-    offsets = []  
-    data = iter(data)
+# Each entry is the offset delta divided by 4, in 1, 2 or 4 big-endian bytes
+# flagged by the top two bits of the first byte. Runs of 1-byte entries are
+# decoded in bulk; bytes with no flag are padding and are skipped
+pof0_entry = re.compile(b"([\x40-\x7F]+)|([\x80-\xBF].)|([\xC0-\xFF]...)", re.DOTALL)
+pof0_low_bits = bytes(i & 0x3F for i in range(0x100))
 
-    for elem in data:
-        power_val = elem & 0xC0
-        value = elem & 0x3F
-        if power_val == 0x40:
-            offset += 4*value
-            offsets.append(offset)
-        elif power_val == 0x80:
-            offset_incr = 4*(value << 8 | next(data))
-            offset += offset_incr
-            offsets.append(offset)
-        elif power_val == 0xC0:
-            offset_incr = 4*(value << 0x18 | next(data) << 0x10 | next(data) << 0x08 | next(data))
-            offset += offset_incr
-            offsets.append(offset)
+def decompressPOF0(data):
+    units = array.array('I')
+    for match in pof0_entry.finditer(bytes(data)):
+        width = match.lastindex
+        if width == 1:
+            units.extend(match.group(1).translate(pof0_low_bits))
+        elif width == 2:
+            units.append(int.from_bytes(match.group(2), "big") & 0x3FFF)
         else:
-            continue
-    return offsets
-
-def decompressPOF0_alt_alt(data):
-    offset = 0
-    offsets = []  
-    data = iter(data)
-
-    for elem in data:
-        bit_power = (elem & 0xC0) >> 6
-        if bit_power == 0:
-            continue
-        bitwidth = 1 << (bit_power - 1)
-        value = elem & 0x3F
-        for _ in range(bitwidth - 1):
-            value << 8
-            value |= next(data)
-            
-        offset = 4*value
-        offsets.append(offset)
+            units.append(int.from_bytes(match.group(3), "big") & 0x3FFFFFFF)
+    return array.array('I', map((4).__mul__, itertools.accumulate(units)))
 
-    return offsets
-
-def compressPOF0(offsets):
-    data = []
-    previous_offset = 0
-    for offset in offsets:
-        diff = offset - previous_offset
-        assert offset & 0x03 == 0, f"Offset is not a multiple of 4! {offset}"
-        if diff < 2**8:
-            power_val = 0x40
-            byte_1 = diff >> 2
-            
-            data.append(power_val | byte_1)
+# Maps offset differences to their entries, so that each distinct difference
+# is only checked and encoded once per table
+class POF0Entries(dict):
+    def __missing__(self, diff):
+        if diff & 0x03:
+            raise ValueError(f"Offset difference is not a multiple of 4! {diff}")
+        if diff < 0:
+            raise ValueError(f"Offsets must be sorted, found a difference of {diff}.")
+        elif diff < 2**8:
+            entry = bytes((0x40 | (diff >> 2),))
         elif diff < 2**16:
-            power_val = 0x80
-            element_data = diff >> 2
-            
-            byte_1 = (element_data & 0xFF00) >> 0x08
-            byte_2 = (element_data & 0x00FF) >> 0x00
-            data.append(power_val | byte_1)
-            data.append(byte_2)
+            entry = (0x8000 | (diff >> 2)).to_bytes(2, "big")
         elif diff < 2**32:
-            power_val = 0xC0
-            element_data = diff >> 2
-            
-            byte_1 = (element_data & 0xFF000000) >> 0x18
-            byte_2 = (element_data & 0x00FF0000) >> 0x10
-            byte_3 = (element_data & 0x0000FF00) >> 0x08
-            byte_4 = (element_data & 0x000000FF) >> 0x00
-            data.append(power_val | byte_1)
-            data.append(byte_2)
-            data.append(byte_3)
-            data.append(byte_4)
-        
+            entry = (0xC0000000 | (diff >> 2)).to_bytes(4, "big")
         else:
-            raise ValueError(f"Offset differences can be no larger than 2**32: {previous_offset} {offset} {diff}.")
-        previous_offset = offset
-    return data
+            raise ValueError(f"Offset differences can be no larger than 2**32: {diff}.")
+        self[diff] = entry
+        return entry
+
+def compressPOF0(offsets):
+    diffs = map(operator.sub, offsets, itertools.chain((0,), offsets))
+    return b"".join(map(POF0Entries().__getitem__, diffs))
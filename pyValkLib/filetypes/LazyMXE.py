@@ -0,0 +1,69 @@
+from pyValkLib.containers.MXEN.MXENReadWriter import MXENReadWriter
+from pyValkLib.filetypes.MXE import MXE
+from pyValkLib.serialisation.ReadWriter import BufferReader
+
+
+# Only the file info is parsed up front; each table is read on first access
+class LazyMXE:
+    def __init__(self, source):
+        self.source = source
+        self.MXEN = MXENReadWriter(endianness=">")
+        self.MXEC = self.MXEN.MXEC
+        self.loaded_sections = set()
+
+        with BufferReader(self.source) as rw:
+            rw.rw_obj(self.MXEN.header)
+            if self.MXEN.FILETYPE != self.MXEN.header.filetype:
+                raise TypeError(f"Container is {self.MXEN.header.filetype}, expected {self.MXEN.FILETYPE}.")
+
+            self.MXEC.start_pos = self.MXEN.header.header_length
+            rw.seek(self.MXEC.start_pos)
+            rw.anchor_pos = self.MXEC.start_pos
+            rw.rw_obj(self.MXEC.header)
+            if self.MXEC.FILETYPE != self.MXEC.header.filetype:
+                raise TypeError(f"Container is {self.MXEC.header.filetype}, expected {self.MXEC.FILETYPE}.")
+            self.MXEC.check_header_size(rw)
+            rw.assert_equal(self.MXEC.header.flags, 0x18000000, lambda x: hex(x))
+            rw.rw_obj_method(self.MXEC, self.MXEC.rw_fileinfo)
+
+    def load_section(self, name, offset, method):
+        if name in self.loaded_sections:
+            return
+        if offset != 0:
+            with BufferReader(self.source) as rw:
+                rw.anchor_pos = self.MXEC.start_pos
+                rw.local_seek(offset)
+                rw.rw_obj_method(self.MXEC, method)
+        self.loaded_sections.add(name)
+
+    @property
+    def parameter_sets_table(self):
+        self.load_section("parameter_sets_table", self.MXEC.parameter_sets_table_ptr, self.MXEC.rw_parameter_sets_table)
+        return self.MXEC.parameter_sets_table
+
+    @property
+    def entity_table(self):
+        self.load_section("entity_table", self.MXEC.entity_table_ptr, self.MXEC.rw_entities_table)
+        return self.MXEC.entity_table
+
+    @property
+    def pathing_table(self):
+        self.load_section("pathing_table", self.MXEC.pathing_table_ptr, self.MXEC.rw_pathing_table)
+        return self.MXEC.pathing_table
+
+    @property
+    def asset_table(self):
+        self.load_section("asset_table", self.MXEC.asset_table_ptr, self.MXEC.rw_asset_table)
+        return self.MXEC.asset_table
+
+    def read_string(self, offset, encoding="cp932"):
+        with BufferReader(self.source) as rw:
+            rw.anchor_pos = self.MXEC.start_pos
+            rw.local_seek(offset)
+            return rw.rw_cstr(None, encoding)
+
+    def to_interface(self):
+        return MXE.init_from_file(self.source)
+
+    def __repr__(self):
+        return f"Lazy MXE Object: Loaded sections {sorted(self.loaded_sections)}."
@@ -7,21 +7,21 @@ from pyValkLib.serialisation.Serializable import Context, Serializable
 class MXE(Serializable):
     def __init__(self, context=None):
         if context is None:
-            context = Context()
+            context = Context.get()
         super().__init__(context)
         self.MXEN = MXENReadWriter(endianness=">")
         self.EOFC = EOFCReadWriter(endianness="<")
     
     @classmethod
-    def init_from_file(cls, filepath):
+    def init_from_file(cls, source, profiler=None):
         instance = cls()
-        instance.read(filepath)
+        instance.read(source, profiler)
         return MXECInterface.from_subreader(instance.MXEN.MXEC)
     
     @classmethod
-    def init_from_mxecinterface(cls, mxec):
+    def init_from_mxecinterface(cls, mxec, profiler=None, relocation_cache=None):
         instance = cls()
-        instance.MXEN.MXEC = mxec.to_subreader(1)
+        instance.MXEN.MXEC = mxec.to_subreader(1, profiler, relocation_cache)
         instance.MXEN.header.depth = 0
         instance.MXEN.header.contents_length = instance.MXEN.header.data_length + instance.MXEN.MXEC.header.header_length + instance.MXEN.MXEC.header.contents_length
         
@@ -31,6 +31,13 @@ class MXE(Serializable):
         instance.EOFC.header.contents_length = 0
         return instance
     
+    def get_size(self):
+        return self.MXEN.header.header_length + self.MXEN.header.contents_length \
+             + self.EOFC.header.header_length + self.EOFC.header.contents_length
+    
+    def write(self, filepath=None, profiler=None):
+        return super().write(filepath, self.get_size(), profiler)
+    
     def read_write(self, rw):
         rw.rw_obj(self.MXEN)
         rw.rw_obj(self.EOFC)
@@ -0,0 +1,458 @@
+import array
+import bisect
+import itertools
+import struct
+
+from pyValkLib.serialisation.ReadWriter import BufferReader
+from pyValkLib.serialisation.Serializable import Context
+from pyValkLib.serialisation.ValkSerializable import Header32B
+from pyValkLib.containers.POF0.POF0ReadWriter import decompressPOF0, compressPOF0
+from pyValkLib.containers.ENRS.ENRSCompression import decompressENRS, compressENRS, enrs_type_sizes
+from pyValkLib.containers.CCRS.CCRSCompression import decompressCCRS, compressCCRS, ccrs_type_sizes
+from pyValkLib.containers.MXEN.MXEC.MXECReadWriter import MXECReadWriter
+from pyValkLib.utils.Compression.Stencilled.runs import SCRunGroup, runs_to_groups, make_template
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+relocation_tables = ("POF0", "ENRS", "CCRS")
+
+MXEC_FILEINFO_SIZE = 0x40
+
+
+# Only the container headers and relocation tables are decoded
+class RawMXE:
+    __slots__ = ("buffer", "headers", "offsets", "endianness")
+
+    def __init__(self, source):
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self.buffer = bytearray(source)
+        else:
+            with open(source, 'rb') as F:
+                self.buffer = bytearray(F.read())
+        self.read_headers()
+        self.endianness = self.detect_endianness()
+
+    def read_headers(self):
+        self.headers = {}
+        self.offsets = {}
+        with BufferReader(self.buffer) as rw:
+            mxen_header = self.read_header(rw, 0, "MXEN")
+            mxec_offset = mxen_header.header_length
+            mxec_header = self.read_header(rw, mxec_offset, "MXEC")
+
+            # The MXEC subcontainers follow its data block
+            offset = mxec_offset + mxec_header.header_length + mxec_header.data_length
+            end = mxec_offset + mxec_header.header_length + mxec_header.contents_length
+            while offset < end:
+                header = self.read_header(rw, offset, None)
+                offset += header.header_length + header.contents_length
+
+    def read_header(self, rw, offset, filetype):
+        rw.seek(offset)
+        header = rw.rw_obj(Header32B(Context.get("<"), filetype))
+        if filetype is not None and header.filetype != filetype:
+            raise TypeError(f"Container is {header.filetype}, expected {filetype}.")
+        self.headers[header.filetype] = header
+        self.offsets[header.filetype] = offset
+        return header
+
+    def get_data(self, filetype):
+        start = self.get_data_offset(filetype)
+        return bytes(self.buffer[start:start + self.headers[filetype].data_length])
+
+    def get_data_offset(self, filetype):
+        return self.offsets[filetype] + self.headers[filetype].header_length
+
+    def detect_endianness(self):
+        # The MXEC file info always has a 32-bit 1 at 0x10
+        unknown_0x30 = self.get_data_offset("MXEC") + 0x10
+        value = bytes(self.buffer[unknown_0x30:unknown_0x30 + 4])
+        if value == b"\x00\x00\x00\x01":
+            return ">"
+        elif value == b"\x01\x00\x00\x00":
+            return "<"
+        else:
+            raise ValueError(f"Unable to determine the endianness of the MXEC: expected 1 at 0x30, found 0x{value.hex()}.")
+
+    # MXEC-local, so including the MXEC header
+    def get_pof0_offsets(self):
+        data = self.get_data("POF0")
+        data_size = int.from_bytes(data[0x00:0x04], "little")
+        return decompressPOF0(data[0x04:data_size])
+
+    def get_ccrs_groups(self):
+        data = self.get_data("CCRS")
+        num_groups = int.from_bytes(data[0x04:0x08], "little")
+        return decompressCCRS(num_groups, data[0x10:])
+
+    def get_enrs_groups(self):
+        data = self.get_data("ENRS")
+        num_groups = int.from_bytes(data[0x04:0x08], "little")
+        return decompressENRS(num_groups, data[0x10:])
+
+    # Touching runs are merged so that the result does not depend on how the
+    # table was compressed
+    def get_relocation_runs(self, filetype):
+        if filetype not in self.headers:
+            return []
+        elif filetype == "ENRS":
+            groups, type_sizes = self.get_enrs_groups(), enrs_type_sizes
+        elif filetype == "CCRS":
+            groups, type_sizes = self.get_ccrs_groups(), ccrs_type_sizes
+        else:
+            raise ValueError(f"{filetype} is not a stencil-compressed relocation table.")
+        return merge_runs(sorted(run for group in groups for run in group.iter_runs(type_sizes)), type_sizes)
+
+    # The headers and relocation tables are always little-endian
+    def swap_endianness(self):
+        byteswap_groups(self.buffer, self.get_enrs_groups(), enrs_type_sizes, self.get_data_offset("MXEC"))
+        self.endianness = "<" if self.endianness == ">" else ">"
+
+    def patch(self, patches):
+        mxec_offset = self.offsets["MXEC"]
+        for offset, value in patches:
+            position = mxec_offset + offset
+            self.buffer[position:position + len(value)] = value
+
+    def rebase_pointers(self, offset, delta):
+        rebase_pointers(self.buffer, self.get_pof0_offsets(), offset, delta, self.offsets["MXEC"], self.endianness)
+
+    def get_string_bank_range(self):
+        _, start, end = self.read_table_layout()
+        return start, end
+
+    # The string bank follows the last entry table and runs up to the unknowns,
+    # or to the end of the data block. Only those two tables are parsed
+    def read_table_layout(self):
+        mxec_header = self.headers["MXEC"]
+        mxec = MXECReadWriter(self.endianness)
+        with BufferReader(self.buffer) as rw:
+            rw.anchor_pos = self.offsets["MXEC"]
+            rw.local_seek(mxec_header.header_length)
+            rw.rw_obj_method(mxec, mxec.rw_fileinfo)
+            start = rw.local_tell()
+            tables = [(mxec.parameter_sets_table_ptr, mxec.rw_parameter_sets_table),
+                      (mxec.entity_table_ptr,         mxec.rw_entities_table),
+                      (mxec.pathing_table_ptr,        mxec.rw_pathing_table),
+                      (mxec.asset_table_ptr,          mxec.rw_asset_table)]
+            tables = [(ptr, method) for ptr, method in tables if ptr != 0]
+            for ptr, method in tables:
+                if ptr == mxec.entity_table_ptr or ptr == tables[-1][0]:
+                    rw.local_seek(ptr)
+                    rw.rw_obj_method(mxec, method)
+                    start = rw.local_tell()
+        unknowns = [entry.unknown_data_ptr for entry in mxec.entity_table.entries.data if entry.unknown_data_ptr > 0]
+        end = min(unknowns) if len(unknowns) else mxec_header.header_length + mxec_header.data_length
+        return mxec, start, end
+
+    # Only whole strings in the string bank can be spliced: the range must start
+    # at a string, and end at the start of a string or at a terminator. Entry
+    # names hold the entry's type, so a replacement name must keep it.
+    def check_string_bank_splice(self, offset, end, data, bank_start, bank_end):
+        mxec_offset = self.offsets["MXEC"]
+        if offset < bank_start or end > bank_end:
+            raise ValueError(f"Splice range 0x{offset:x}-0x{end:x} crosses the edge of the string bank 0x{bank_start:x}-0x{bank_end:x}.")
+        if offset != bank_start and self.buffer[mxec_offset + offset - 1] != 0:
+            raise ValueError(f"Splice range 0x{offset:x}-0x{end:x} starts inside a string.")
+        ends_at_terminator = end < bank_end and self.buffer[mxec_offset + end] == 0
+        if not (ends_at_terminator or end == bank_end or self.buffer[mxec_offset + end - 1] == 0):
+            raise ValueError(f"Splice range 0x{offset:x}-0x{end:x} ends inside a string.")
+        if not ends_at_terminator and len(data) and data[-1] != 0:
+            raise ValueError(f"Splice range 0x{offset:x}-0x{end:x} is not followed by a terminator, so 'data' must end with one.")
+
+    # Replaces the range with 'data', which may be anywhere after the file
+    # info: in the entry tables, for example to append parameter sets, or in
+    # the string bank, where it must cover whole strings. 'pointers' holds the
+    # offsets of the pointer slots in 'data', and 'enrs_runs'/'ccrs_runs' its
+    # relocations as (start, count, type) runs, all relative to the start of
+    # 'data'. The pointer values in 'data' must already hold their post-splice
+    # targets. Pointers and relocations in the old range are dropped, those
+    # past it are moved, as are the asset table's field offsets, and nothing
+    # outside the range may point inside it. The size may only change by a
+    # multiple of 0x10. Entry and asset counts are not touched, so a splice
+    # that adds or removes entries must patch them.
+    def splice(self, offset, length, data=b"", pointers=(), enrs_runs=(), ccrs_runs=()):
+        mxec_offset = self.offsets["MXEC"]
+        mxec_header = self.headers["MXEC"]
+        data_start = mxec_header.header_length
+        data_end = data_start + mxec_header.data_length
+        tables_start = data_start + MXEC_FILEINFO_SIZE
+        end = offset + length
+        delta = len(data) - length
+        if length < 0 or offset < tables_start or end > data_end:
+            raise ValueError(f"Splice range 0x{offset:x}-0x{end:x} is outside the MXEC tables 0x{tables_start:x}-0x{data_end:x}.")
+        mxec, bank_start, bank_end = self.read_table_layout()
+        if offset < bank_end and end > bank_start:
+            self.check_string_bank_splice(offset, end, data, bank_start, bank_end)
+        # The string banks and the unknowns section are 0x10-aligned, and
+        # re-padding them would move data that nothing here accounts for
+        if delta % 0x10:
+            raise ValueError(f"Splices must change the data size by a multiple of 0x10, got {delta}.")
+        for pointer in pointers:
+            if pointer < 0 or pointer + 4 > len(data):
+                raise ValueError(f"Pointer slot at 0x{pointer:x} is outside the {len(data)} bytes of spliced data.")
+
+        # Pointer slots
+        slots = self.get_pof0_offsets()
+        lo = bisect.bisect_left(slots, offset - 3)
+        hi = bisect.bisect_left(slots, end)
+        for slot in slots[lo:hi]:
+            if slot < offset or slot + 4 > end:
+                raise ValueError(f"Splice range 0x{offset:x}-0x{end:x} cuts through the pointer at 0x{slot:x}.")
+        kept_slots = slots[:lo] + slots[hi:]
+        # The asset table lists the asset fields by offset, outside of POF0
+        asset_slots = []
+        if mxec.asset_table_ptr != 0:
+            asset_slots_start = mxec.asset_table.asset_use_offset
+            asset_slots = [asset_slots_start + 4*i for i in range(mxec.asset_table.asset_use_count)]
+            asset_slots = [slot for slot in asset_slots if slot + 4 <= offset or slot >= end]
+        slot_packer = struct.Struct(self.endianness + "I")
+        for slot in itertools.chain(kept_slots, asset_slots):
+            value, = slot_packer.unpack_from(self.buffer, mxec_offset + slot)
+            if offset < value < end:
+                raise ValueError(f"Pointer at 0x{slot:x} points inside the splice range 0x{offset:x}-0x{end:x}.")
+        rebase_pointers(self.buffer, kept_slots, end, delta, mxec_offset, self.endianness)
+        rebase_pointers(self.buffer, asset_slots, end, delta, mxec_offset, self.endianness)
+        slots = slots[:lo]
+        slots.extend(offset + pointer for pointer in sorted(pointers))
+        slots.extend(slot + delta for slot in kept_slots[lo:])
+
+        # ENRS/CCRS offsets are relative to the start of the data block
+        enrs_groups = splice_groups(self.get_enrs_groups(), enrs_type_sizes, offset - data_start, end - data_start, delta, enrs_runs, "ENRS")
+        ccrs_groups = splice_groups(self.get_ccrs_groups(), ccrs_type_sizes, offset - data_start, end - data_start, delta, ccrs_runs, "CCRS")
+
+        # Splice the data, keeping the data block 0x10-aligned
+        self.buffer[mxec_offset + offset:mxec_offset + end] = data
+        new_data_length = mxec_header.data_length + delta
+        padding = (0x10 - (new_data_length % 0x10)) % 0x10
+        subcontainers_offset = mxec_offset + data_start + new_data_length
+        self.buffer[subcontainers_offset:subcontainers_offset] = bytes(padding)
+        subcontainers_offset += padding
+        mxec_header.data_length = new_data_length + padding
+
+        # Rebuild the subcontainers
+        pof0_data = compressPOF0(slots)
+        contents = {
+            "POF0": (4 + len(pof0_data)).to_bytes(4, "little") + pof0_data,
+            "ENRS": bytes(4) + len(enrs_groups).to_bytes(4, "little") + bytes(8) + compressENRS(enrs_groups),
+            "CCRS": bytes(4) + len(ccrs_groups).to_bytes(4, "little") + bytes(8) + compressCCRS(ccrs_groups)
+        }
+        subcontainers = bytearray()
+        for filetype, header in self.headers.items():
+            if filetype in ("MXEN", "MXEC"):
+                continue
+            if filetype in contents:
+                block = contents[filetype]
+                block += bytes((0x10 - (len(block) % 0x10)) % 0x10)
+                header.data_length = len(block)
+                header.contents_length = len(block)
+                subcontainers += header.write()
+                subcontainers += block
+            else:
+                start = self.offsets[filetype]
+                subcontainers += self.buffer[start + delta + padding:start + delta + padding + header.header_length + header.contents_length]
+        subcontainers_end = mxec_offset + data_start + mxec_header.contents_length + delta + padding
+        self.buffer[subcontainers_offset:subcontainers_end] = subcontainers
+
+        # Update the headers
+        mxec_header.contents_length = mxec_header.data_length + len(subcontainers)
+        mxen_header = self.headers["MXEN"]
+        mxen_header.contents_length = mxen_header.data_length + mxec_header.header_length + mxec_header.contents_length
+        self.buffer[0:mxen_header.header_length] = mxen_header.write()
+        self.buffer[mxec_offset:mxec_offset + data_start] = mxec_header.write()
+        self.read_headers()
+
+    def write(self, filepath=None):
+        if filepath is None:
+            return bytes(self.buffer)
+        with open(filepath, 'wb') as F:
+            F.write(self.buffer)
+
+    def __repr__(self):
+        return f"Raw MXE Object: [{len(self.buffer)}] bytes. Contains {', '.join(self.headers)}."
+
+
+# Returns the first divergence of each differing table as (filetype, index,
+# original entry, rebuilt entry)
+def compare_relocations(original, rebuilt):
+    divergences = []
+    for filetype in relocation_tables:
+        if filetype in original.headers and filetype in rebuilt.headers \
+        and original.get_data(filetype) == rebuilt.get_data(filetype):
+            continue
+        if filetype == "POF0":
+            original_offsets = original.get_pof0_offsets() if filetype in original.headers else array.array('I')
+            rebuilt_offsets = rebuilt.get_pof0_offsets() if filetype in rebuilt.headers else array.array('I')
+            index = find_first_divergence(original_offsets, rebuilt_offsets)
+            divergence = None if index is None else (index, get_entry(original_offsets, index), get_entry(rebuilt_offsets, index))
+        else:
+            type_sizes = enrs_type_sizes if filetype == "ENRS" else ccrs_type_sizes
+            divergence = find_first_run_divergence(original.get_relocation_runs(filetype), rebuilt.get_relocation_runs(filetype), type_sizes)
+        if divergence is not None:
+            divergences.append((filetype, *divergence))
+    return divergences
+
+def find_first_divergence(original, rebuilt):
+    n = min(len(original), len(rebuilt))
+    if n:
+        if np is not None:
+            dtype = np.dtype(f"u{original.itemsize}")
+            mismatches = np.flatnonzero(np.frombuffer(original, dtype=dtype, count=n) != np.frombuffer(rebuilt, dtype=dtype, count=n))
+            if len(mismatches):
+                return int(mismatches[0])
+        elif original[:n] != rebuilt[:n]:
+            return next(i for i, (a, b) in enumerate(zip(original, rebuilt)) if a != b)
+    return n if len(original) != len(rebuilt) else None
+
+# Items are (offset, type). The runs are compared as (start, count, type)
+# columns, and only the first differing run is looked into
+def find_first_run_divergence(original, rebuilt, type_sizes):
+    original_columns = get_run_columns(original)
+    rebuilt_columns = get_run_columns(rebuilt)
+    mismatches = [find_first_divergence(original_column, rebuilt_column)
+                  for original_column, rebuilt_column in zip(original_columns, rebuilt_columns)]
+    mismatches = [i for i in mismatches if i is not None]
+    if not len(mismatches):
+        return None
+    i = min(mismatches)
+    index = sum(original_columns[1][:i])
+    if i == len(original) or i == len(rebuilt):
+        return index, get_run_item(original, i), get_run_item(rebuilt, i)
+
+    original_start, original_count, original_type = original[i]
+    rebuilt_start, rebuilt_count, rebuilt_type = rebuilt[i]
+    if original_start != rebuilt_start or original_type != rebuilt_type:
+        return index, (original_start, original_type), (rebuilt_start, rebuilt_type)
+
+    # The runs only differ in length, so the shorter one moves on to its
+    # next run first
+    count = min(original_count, rebuilt_count)
+    item = (original_start + count*type_sizes[original_type], original_type)
+    if original_count > rebuilt_count:
+        return index + count, item, get_run_item(rebuilt, i + 1)
+    else:
+        return index + count, get_run_item(original, i + 1), item
+
+def get_run_columns(runs):
+    columns = tuple(zip(*runs)) or ((), (), ())
+    return [array.array('I', column) for column in columns]
+
+def get_entry(entries, index):
+    return entries[index] if index < len(entries) else None
+
+def get_run_item(runs, index):
+    if index >= len(runs):
+        return None
+    start, _, type_ = runs[index]
+    return start, type_
+
+def merge_runs(runs, type_sizes):
+    merged = []
+    for start, count, type_ in runs:
+        if len(merged):
+            prev_start, prev_count, prev_type = merged[-1]
+            if prev_type == type_ and prev_start + prev_count*type_sizes[type_] == start:
+                merged[-1] = (prev_start, prev_count + count, type_)
+                continue
+        merged.append((start, count, type_))
+    return merged
+
+# Each item is swapped across every template instance, or each instance
+# across a run, with extended slices, whichever needs fewer of them
+def byteswap_groups(buffer, groups, type_sizes, base_offset=0):
+    for group in groups:
+        group_offset = base_offset + group.offset
+        for start, count, type_ in group.get_template_runs(type_sizes):
+            size = type_sizes[type_]
+            if size == 1:
+                continue
+            if group.count > 1 and count < group.count:
+                # Swap each item of the run across every template instance
+                span = group.stride*(group.count - 1) + 1
+                for i in range(count):
+                    item_offset = group_offset + start + i*size
+                    swap_bytes(buffer, item_offset, size, group.stride, span)
+            else:
+                # Swap each template instance across the items of the run
+                span = size*(count - 1) + 1
+                for i in range(group.count):
+                    run_offset = group_offset + i*group.stride + start
+                    swap_bytes(buffer, run_offset, size, size, span)
+
+def rebase_pointers(buffer, slot_offsets, offset, delta, base_offset=0, endianness=">"):
+    packer = struct.Struct(endianness + "I")
+    for slot in slot_offsets:
+        position = base_offset + slot
+        value, = packer.unpack_from(buffer, position)
+        if value >= offset:
+            packer.pack_into(buffer, position, value + delta)
+
+# Instances inside the range are dropped and those past it are moved, so a
+# group with instances on both sides of it is split in two. 'runs' are the
+# relocations of the spliced data, relative to its start. They form a group
+# of their own, or extend an array that ends where they start
+def splice_groups(groups, type_sizes, start, end, delta, runs, name):
+    out = []
+    for group in groups:
+        extent = group.get_extent(type_sizes) - group.stride*(group.count - 1)
+        # Instances [0, n_before) end before the range, [first_inside,
+        # n_inside) lie within it, and [first_after, count) start after it
+        n_before    = clamp_instance((start - extent - group.offset)//group.stride + 1, group.count)
+        first_after = clamp_instance(-((group.offset - end)//group.stride), group.count)
+        if n_before != first_after:
+            first_inside = clamp_instance(-((group.offset - start)//group.stride), group.count)
+            n_inside     = clamp_instance((end - extent - group.offset)//group.stride + 1, group.count)
+            if first_inside > n_before or n_inside < first_after:
+                if group.count == 1:
+                    out.extend(split_single_group(group, type_sizes, start, end, delta, name))
+                    continue
+                raise ValueError(f"Splice range 0x{start:x}-0x{end:x} cuts through the {name} group at 0x{group.offset:x}.")
+        if n_before:
+            out.append(SCRunGroup(group.offset, group.stride if n_before > 1 else 1, n_before, group.components))
+        n_after = group.count - first_after
+        if n_after:
+            out.append(SCRunGroup(group.offset + first_after*group.stride + delta, group.stride if n_after > 1 else 1, n_after, group.components))
+
+    if len(runs):
+        runs = sorted((start + run_start, count, type_) for run_start, count, type_ in runs)
+        for run_start, count, type_ in runs:
+            if run_start < start or run_start + count*type_sizes[type_] > end + delta:
+                raise ValueError(f"{name} run at 0x{run_start - start:x} is outside the spliced data.")
+        new_group, = runs_to_groups([[make_template(runs)]], type_sizes)
+        for i, group in enumerate(out):
+            if group.count > 1 and group.components == new_group.components \
+            and group.offset + group.count*group.stride == new_group.offset:
+                out[i] = SCRunGroup(group.offset, group.stride, group.count + 1, group.components)
+                break
+        else:
+            out.append(new_group)
+    out.sort(key=lambda group: group.offset)
+    return out
+
+def clamp_instance(index, count):
+    return min(max(index, 0), count)
+
+def split_single_group(group, type_sizes, start, end, delta, name):
+    before = []
+    after = []
+    for run_start, count, type_ in group.get_template_runs(type_sizes):
+        run_start += group.offset
+        run_end = run_start + count*type_sizes[type_]
+        if run_end <= start:
+            before.append((run_start, count, type_))
+        elif run_start >= end:
+            after.append((run_start + delta, count, type_))
+        elif run_start < start or run_end > end:
+            raise ValueError(f"Splice range 0x{start:x}-0x{end:x} cuts through the {name} group at 0x{group.offset:x}.")
+    return runs_to_groups([[make_template(runs)] for runs in (before, after) if len(runs)], type_sizes)
+
+def swap_bytes(buffer, offset, size, step, span):
+    for lo in range(size >> 1):
+        hi = size - 1 - lo
+        lo_slice = slice(offset + lo, offset + lo + span, step)
+        hi_slice = slice(offset + hi, offset + hi + span, step)
+        buffer[lo_slice], buffer[hi_slice] = buffer[hi_slice], buffer[lo_slice]
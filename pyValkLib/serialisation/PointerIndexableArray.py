@@ -1,18 +1,35 @@
+import array
+import bisect
+
 from pyValkLib.serialisation.Serializable import Serializable
 
 
+# 'offsets' is kept sorted, so pointers are resolved with a bisect
 class PointerIndexableArray(Serializable):
+    __slots__ = ("data", "offsets")
+    
     def __init__(self, context):
         super().__init__(context)
-        #self.context.anchor_pos = context.anchor_pos
-        #self.context.endianness = context.endianness
-        
         self.data = []
-        self.ptr_to_idx = {}
-        self.idx_to_ptr = {}
+        self.offsets = array.array('I')
+        
+    def append(self, elem, ptr):
+        if len(self.offsets) and ptr < self.offsets[-1]:
+            raise ValueError(f"Elements must be appended in offset order: 0x{ptr:x} is before 0x{self.offsets[-1]:x}.")
+        self.data.append(elem)
+        self.offsets.append(ptr)
+        
+    def get_idx(self, ptr):
+        idx = bisect.bisect_left(self.offsets, ptr)
+        if idx == len(self.offsets) or self.offsets[idx] != ptr:
+            raise KeyError(ptr)
+        return idx
+    
+    def get_ptr(self, idx):
+        return self.offsets[idx]
         
     def at_ptr(self, ptr):
-        return self.data[self.ptr_to_idx[ptr]]
+        return self.data[self.get_idx(ptr)]
     
     def at_idx(self, idx):
         return self.data[idx]
@@ -26,13 +43,14 @@ class PointerIndexableArray(Serializable):
     
     def read_write(self, rw):
         rw.mark_new_contents_array()
+        offsets = self.offsets
+        # Offsets are recorded by the first traversal; later ones only check them
         for i, elem in enumerate(self.data):
             rw.mark_new_contents_array_member()
-            if i in self.idx_to_ptr:
-                rw.assert_local_file_pointer_now_at("Start of Array Entry", self.idx_to_ptr[i])
-            curpos = rw.local_tell()
-            self.ptr_to_idx[curpos] = i
-            self.idx_to_ptr[i] = curpos
+            if i < len(offsets):
+                rw.assert_local_file_pointer_now_at("Start of Array Entry", offsets[i])
+            else:
+                offsets.append(rw.local_tell())
 
             self.rw_element(rw, i)
             
@@ -47,39 +65,52 @@ class PointerIndexableArray(Serializable):
         return len(self.data)
     
 class PointerIndexableArrayInt8(PointerIndexableArray):
+    __slots__ = ()
     def rw_element(self, rw, idx): self.data[idx] = rw.rw_int8(self.data[idx])
     
 class PointerIndexableArrayUint8(PointerIndexableArray):
+    __slots__ = ()
     def rw_element(self, rw, idx): self.data[idx] = rw.rw_uint8(self.data[idx])
     
 class PointerIndexableArrayInt16(PointerIndexableArray):
+    __slots__ = ()
     def rw_element(self, rw, idx): self.data[idx] = rw.rw_int16(self.data[idx])
     
 class PointerIndexableArrayUint16(PointerIndexableArray):
+    __slots__ = ()
     def rw_element(self, rw, idx): self.data[idx] = rw.rw_uint16(self.data[idx])
     
 class PointerIndexableArrayInt32(PointerIndexableArray):
+    __slots__ = ()
     def rw_element(self, rw, idx): self.data[idx] = rw.rw_int32(self.data[idx])
     
 class PointerIndexableArrayUint32(PointerIndexableArray):
+    __slots__ = ()
     def rw_element(self, rw, idx): self.data[idx] = rw.rw_uint32(self.data[idx])
     
 class PointerIndexableArrayInt64(PointerIndexableArray):
+    __slots__ = ()
     def rw_element(self, rw, idx): self.data[idx] = rw.rw_int64(self.data[idx])
     
 class PointerIndexableArrayUint64(PointerIndexableArray):
+    __slots__ = ()
     def rw_element(self, rw, idx): self.data[idx] = rw.rw_uint64(self.data[idx])
     
 class PointerIndexableArrayFloat16(PointerIndexableArray):
+    __slots__ = ()
     def rw_element(self, rw, idx): self.data[idx] = rw.rw_float16(self.data[idx])
     
 class PointerIndexableArrayFloat32(PointerIndexableArray):
+    __slots__ = ()
     def rw_element(self, rw, idx): self.data[idx] = rw.rw_float64(self.data[idx])
     
 class PointerIndexableArrayFloat64(PointerIndexableArray):
+    __slots__ = ()
     def rw_element(self, rw, idx): self.data[idx] = rw.rw_float64(self.data[idx])
     
 class PointerIndexableArrayCStr(PointerIndexableArray):
+    __slots__ = ("encoding",)
+    
     def __init__(self, context, encoding='ascii'):
         super().__init__(context)
         self.encoding = encoding
@@ -0,0 +1,77 @@
+import json
+import time
+
+
+# Totals the distance moved by seeks, so that the profiler can tell it apart
+# from the bytes that were read or written. Only readers and writers with a
+# profiler attached are given this seek
+class ProfiledSeek:
+    __slots__ = ()
+
+    def seek(self, offset, whence=0):
+        start = self.tell()
+        super().seek(offset, whence)
+        self.seek_displacement += self.tell() - start
+
+
+profiled_classes = {}
+def get_profiled_class(cls):
+    profiled_cls = profiled_classes.get(cls)
+    if profiled_cls is None:
+        profiled_cls = type(f"Profiled{cls.__name__}", (ProfiledSeek, cls), {"__slots__": ()})
+        profiled_classes[cls] = profiled_cls
+    return profiled_cls
+
+
+# Times are inclusive, so nested sections also count towards their parent
+class Profiler:
+    __slots__ = ("records", "current_mark", "mark_start")
+
+    def __init__(self):
+        self.records = {}
+        self.current_mark = None
+        self.mark_start = None
+
+    def attach(self, rw):
+        if not isinstance(rw, ProfiledSeek):
+            rw.__class__ = get_profiled_class(type(rw))
+        rw.profiler = self
+
+    def record(self, name, n_bytes, elapsed):
+        entry = self.records.get(name)
+        if entry is None:
+            entry = {"calls": 0, "bytes": 0, "time": 0.}
+            self.records[name] = entry
+        entry["calls"] += 1
+        entry["bytes"] += n_bytes
+        entry["time"]  += elapsed
+
+    # Seeks are taken off the change in position, so that only the bytes
+    # read or written by the call are counted
+    def call(self, name, rw, func, *args, **kwargs):
+        start_pos = rw.tell() - rw.seek_displacement
+        start_time = time.perf_counter()
+        result = func(rw, *args, **kwargs)
+        self.record(name, rw.tell() - rw.seek_displacement - start_pos, time.perf_counter() - start_time)
+        return result
+
+    # None closes the current mark without opening another
+    def mark(self, name):
+        now = time.perf_counter()
+        if self.current_mark is not None:
+            self.record(self.current_mark, 0, now - self.mark_start)
+        self.current_mark = name
+        self.mark_start = now
+
+    def to_dict(self):
+        return {name: dict(entry) for name, entry in self.records.items()}
+
+    def to_json(self, filepath=None, indent=2):
+        out = json.dumps(self.to_dict(), indent=indent)
+        if filepath is not None:
+            with open(filepath, 'w') as F:
+                F.write(out)
+        return out
+
+    def __repr__(self):
+        return "\n".join(f"{name}: {entry['calls']} calls, {entry['bytes']} bytes, {entry['time']:.6f}s" for name, entry in self.records.items())
@@ -1,17 +1,48 @@
 import array
+import mmap
+import os
+import re
 import struct
+import sys
 
 from .Utils import chunk_list, flatten_list
+from .StringPool import string_pool
 
 
+# Shared by reference: use Context.get or with_endianness rather than copying
 class Context:
-    __slots__ = ("endianness")
+    __slots__ = ("endianness",)
     
-    def __init__(self):
-        self.endianness = "<"
+    _interned = {}
+    
+    def __init__(self, endianness="<"):
+        object.__setattr__(self, "endianness", endianness)
         
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Context is immutable: use with_endianness() instead of setting '{name}'.")
+        
+    def __copy__(self):
+        return self
+    
+    def __deepcopy__(self, memo):
+        return self
+    
+    @classmethod
+    def get(cls, endianness="<"):
+        context = cls._interned.get(endianness)
+        if context is None:
+            context = cls(endianness)
+            cls._interned[endianness] = context
+        return context
+    
+    def with_endianness(self, endianness):
+        if endianness == self.endianness:
+            return self
+        return self.get(endianness)
+        
+
 class ReadWriterBase:
-    __slots__ = ("filename", "endianness", "bytestream", "anchor_pos", "context")
+    __slots__ = ("filename", "endianness", "bytestream", "anchor_pos", "context", "profiler", "seek_displacement")
     
     open_flags=None
     
@@ -42,7 +73,9 @@ class ReadWriterBase:
         self.filename = filename
         self.bytestream = None
         self.anchor_pos = 0
-        self.context = Context()
+        self.context = Context.get()
+        self.profiler = None
+        self.seek_displacement = 0
         
     # Context managers are a decent approximation of RAII behaviour
     def __enter__(self):
@@ -78,16 +111,29 @@ class ReadWriterBase:
     def rw_obj(self, obj):
         previous_context = self.context
         self.context = obj.context
-        obj.read_write(self)
+        if self.profiler is None:
+            obj.read_write(self)
+        else:
+            name = getattr(obj, "FILETYPE", None) or type(obj).__name__
+            self.profiler.call(name, self, obj.read_write)
         self.context = previous_context
         return obj
     
     def rw_obj_method(self, obj, method, *args, **kwargs):
         previous_context = self.context
         self.context = obj.context
-        method(self, *args, **kwargs)
+        if self.profiler is None:
+            method(self, *args, **kwargs)
+        else:
+            self.profiler.call(f"{type(obj).__name__}.{method.__name__}", self, method, *args, **kwargs)
         self.context = previous_context
         
+    def rw_section(self, name, method, *args, **kwargs):
+        if self.profiler is None:
+            method(self, *args, **kwargs)
+        else:
+            self.profiler.call(name, self, method, *args, **kwargs)
+        
     def align_with(self, offset, alignment, typecode, value, endianness=None):
         if endianness is None:
             endianness = self.context.endianness
@@ -217,6 +263,12 @@ class ReadWriterBase:
     def _rw_multiple(self, typecode, size, value, shape, endianness=None):
         raise NotImplementedError
         
+    def rw_packed(self, packer, value):
+        raise NotImplementedError
+        
+    def rw_bytes(self, value, length):
+        raise NotImplementedError
+        
     def rw_str(self, value, length, encoding='ascii'):
         raise NotImplementedError
         
@@ -233,8 +285,70 @@ class ReadWriterBase:
         raise NotImplementedError
 
 
+##########################
+# Typed Array Conversion #
+##########################
+
+native_endianness = '<' if sys.byteorder == "little" else '>'
+
+# Typecodes that array.array can hold with the same width as struct
+array_typecodes = {tc for tc in "bBhHiIlLqQfd" if array.array(tc).itemsize == struct.calcsize('<' + tc)}
+
+def needs_byteswap(endianness, size):
+    if size == 1 or endianness in "@=":
+        return False
+    return ('>' if endianness == '!' else endianness) != native_endianness
+
+def get_shape_count(shape):
+    if not hasattr(shape, "__getitem__"):
+        shape = (shape,)
+    n_elements = 1
+    for elem in shape:
+        n_elements *= elem
+    return shape, n_elements
+
+def bytes_to_array(raw, typecode, size, shape, n_elements, endianness):
+    if typecode in array_typecodes:
+        data = array.array(typecode)
+        data.frombytes(raw)
+        if needs_byteswap(endianness, size):
+            data.byteswap()
+    else:
+        data = array.array('f' if typecode == 'e' else typecode, struct.unpack(endianness + typecode*n_elements, raw))
+    
+    # Group the lists up
+    # Skip the outer index because we don't need it (we'll automatically
+    # get an end result of that length) and create groups by iterating
+    # over the shape in reverse
+    # The rows stay array slices, so this makes one object per row rather
+    # than per element. A cast memoryview cannot be indexed by row, and a
+    # NumPy view would change the return type depending on the environment
+    for subshape in shape[1::][::-1]:
+        data = chunk_list(data, subshape)
+    return data
+
+def array_to_bytes(value, typecode, size, shape, n_elements, endianness):
+    data = value # Shouldn't need to deepcopy since flatten_list will copy
+    for _ in range(len(shape)-1):
+        data = flatten_list(data)
+        
+    if typecode not in array_typecodes:
+        return struct.pack(endianness + typecode*n_elements, *data)
+    
+    swap = needs_byteswap(endianness, size)
+    if swap or type(data) is not array.array or data.typecode != typecode:
+        data = array.array(typecode, data)
+        
+    if len(data) != n_elements:
+        raise struct.error(f"Expected {n_elements} elements, received {len(data)}.")
+    if swap:
+        data.byteswap()
+    return data.tobytes()
+    
+
 class Reader(ReadWriterBase):
     open_flags = "rb"
+    cstr_chunk_size = 0x40
     
     def rw_color32(self, value, endianness=None):
         data = self._rw_single('I', 4, value, endianness)
@@ -258,29 +372,34 @@ class Reader(ReadWriterBase):
         if endianness is None:
             endianness = self.context.endianness
             
-        if not hasattr(shape, "__getitem__"):
-            shape = (shape,)
-        n_to_read = 1
-        for elem in shape:
-            n_to_read *= elem
-            
-        data = array.array(typecode, struct.unpack(endianness + typecode*n_to_read, self.bytestream.read(size*n_to_read)))
-        # Group the lists up
-        # Skip the outer index because we don't need it (we'll automatically
-        # get an end result of that length) and create groups by iterating
-        # over the shape in reverse
-        for subshape in shape[1::][::-1]:
-            data = chunk_list(data, subshape)
-        return data
+        shape, n_to_read = get_shape_count(shape)
+        raw = self.bytestream.read(size*n_to_read)
+        if len(raw) != size*n_to_read:
+            raise struct.error(f"Expected {size*n_to_read} bytes, only {len(raw)} available.")
+        return bytes_to_array(raw, typecode, size, shape, n_to_read, endianness)
+    
+    def rw_packed(self, packer, value):
+        return packer.unpack(self.bytestream.read(packer.size))
+    
+    def rw_bytes(self, value, length):
+        return self.bytestream.read(length)
         
     def rw_str(self, value, length, encoding='ascii'):
         return self.bytestream.read(length).decode(encoding)
         
     def rw_cstr(self, value, encoding='ascii', end_char=b"\x00"):
-        out = b""
-        while ((val := self.bytestream.read(1)) != end_char and val != b''):
-            out += val
-        return out.decode(encoding)
+        chunks = []
+        while True:
+            chunk = self.bytestream.read(self.cstr_chunk_size)
+            idx = chunk.find(end_char)
+            if idx != -1:
+                chunks.append(chunk[:idx])
+                self.bytestream.seek(idx + len(end_char) - len(chunk), 1)
+                break
+            chunks.append(chunk)
+            if len(chunk) < self.cstr_chunk_size:
+                break
+        return b"".join(chunks).decode(encoding)
     
     def align(self, offset, alignment, padval=b'\x00'):
         n_to_read = (alignment - (offset % alignment)) % alignment
@@ -296,6 +415,117 @@ class Reader(ReadWriterBase):
         return "read"
 
 
+# Reads from a bytes-like object, or from a memory-mapped file if given a path
+class BufferReader(Reader):
+    __slots__ = ("buffer", "position", "file", "buffer_size")
+    
+    def __init__(self, source):
+        if isinstance(source, (str, os.PathLike)):
+            super().__init__(source)
+            self.buffer = None
+        else:
+            super().__init__(None)
+            self.buffer = source
+        self.file = None
+        self.position = 0
+        self.buffer_size = 0
+        
+    def __enter__(self):
+        if self.filename is not None:
+            self.file = open(self.filename, self.open_flags)
+            if os.fstat(self.file.fileno()).st_size:
+                self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self.buffer = b""
+        self.buffer_size = len(self.buffer) if not isinstance(self.buffer, memoryview) else self.buffer.nbytes
+        self.position = 0
+        return self
+        
+    def __exit__(self, exc_type, exc_val, traceback):
+        if self.file is not None:
+            if type(self.buffer) is mmap.mmap:
+                self.buffer.close()
+            self.file.close()
+            self.file = None
+            self.buffer = None
+            
+    def tell(self):
+        return self.position
+    
+    def seek(self, offset, whence=0):
+        if whence == 0:
+            self.position = offset
+        elif whence == 1:
+            self.position += offset
+        elif whence == 2:
+            self.position = self.buffer_size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}.")
+            
+    def _read(self, length):
+        start = self.position
+        end = start + length
+        if end > self.buffer_size:
+            end = self.buffer_size
+        self.position = end
+        return bytes(self.buffer[start:end])
+    
+    def _rw_single(self, typecode, size, value, endianness=None):
+        if endianness is None:
+            endianness = self.context.endianness
+        data = struct.unpack_from(endianness + typecode, self.buffer, self.position)[0]
+        self.position += size
+        return data
+        
+    def _rw_multiple(self, typecode, size, value, shape, endianness=None):
+        if endianness is None:
+            endianness = self.context.endianness
+            
+        shape, n_to_read = get_shape_count(shape)
+        start = self.position
+        end = start + size*n_to_read
+        if end > self.buffer_size:
+            raise struct.error(f"Expected {size*n_to_read} bytes, only {self.buffer_size - start} available.")
+        self.position = end
+        return bytes_to_array(memoryview(self.buffer)[start:end], typecode, size, shape, n_to_read, endianness)
+    
+    def rw_packed(self, packer, value):
+        data = packer.unpack_from(self.buffer, self.position)
+        self.position += packer.size
+        return data
+    
+    def rw_bytes(self, value, length):
+        return self._read(length)
+        
+    def rw_str(self, value, length, encoding='ascii'):
+        return self._read(length).decode(encoding)
+        
+    def _find(self, sub, start):
+        if type(self.buffer) is memoryview:
+            match = re.compile(re.escape(sub)).search(self.buffer, start)
+            return -1 if match is None else match.start()
+        return self.buffer.find(sub, start)
+    
+    def rw_cstr(self, value, encoding='ascii', end_char=b"\x00"):
+        start = self.position
+        end = self._find(end_char, start)
+        if end == -1:
+            return self._read(self.buffer_size - start).decode(encoding)
+        out = bytes(self.buffer[start:end])
+        self.position = end + len(end_char)
+        return out.decode(encoding)
+    
+    def align(self, offset, alignment, padval=b'\x00'):
+        n_to_read = (alignment - (offset % alignment)) % alignment
+        data = self._read(n_to_read)
+        expected = padval * (len(data) // len(padval))
+        assert data == expected, f"Unexpected padding: Expected {expected}, read {data}."
+        
+    def assert_at_eof(self):
+        if self.position < self.buffer_size:
+            raise Exception("Not at end of file!")
+
+
 class Writer(ReadWriterBase):
     open_flags = "wb"
         
@@ -324,16 +554,16 @@ class Writer(ReadWriterBase):
         if endianness is None:
             endianness = self.context.endianness
         
-        if not hasattr(shape, "__getitem__"):
-            shape = (shape,)
-        n_to_read = 1
-        for elem in shape:
-            n_to_read *= elem
-            
-        data = value # Shouldn't need to deepcopy since flatten_list will copy
-        for _ in range(len(shape)-1):
-            data = flatten_list(data)
-        self.bytestream.write(struct.pack(endianness + typecode*n_to_read, *data))
+        shape, n_to_read = get_shape_count(shape)
+        self.bytestream.write(array_to_bytes(value, typecode, size, shape, n_to_read, endianness))
+        return value
+    
+    def rw_packed(self, packer, value):
+        self.bytestream.write(packer.pack(*value))
+        return value
+    
+    def rw_bytes(self, value, length):
+        self.bytestream.write(value)
         return value
         
     def rw_str(self, value, length, encoding='ascii'):
@@ -341,8 +571,7 @@ class Writer(ReadWriterBase):
         return value
         
     def rw_cstr(self, value, encoding='ascii', end_char=b'\x00'):
-        out = value.encode(encoding) + end_char
-        self.bytestream.write(out)
+        self.bytestream.write(string_pool.encode_cstr(value, (encoding,), end_char))
         return value
     
     def align(self, offset, alignment, padval=b'\x00'):
@@ -356,6 +585,92 @@ class Writer(ReadWriterBase):
     def mode(self):
         return "write"
 
+# Fills a bytearray that is flushed in a single call on exit, or kept in
+# memory if no filepath is given
+class BufferWriter(Writer):
+    __slots__ = ("buffer", "position", "end")
+    
+    def __init__(self, filename=None, size=0):
+        super().__init__(filename)
+        self.buffer = bytearray(size)
+        self.position = 0
+        self.end = 0
+        
+    def __enter__(self):
+        self.position = 0
+        self.end = 0
+        return self
+        
+    def __exit__(self, exc_type, exc_val, traceback):
+        if self.filename is not None and exc_type is None:
+            with open(self.filename, self.open_flags) as F:
+                F.write(memoryview(self.buffer)[:self.end])
+                
+    def getvalue(self):
+        return bytes(memoryview(self.buffer)[:self.end])
+    
+    def tell(self):
+        return self.position
+    
+    def seek(self, offset, whence=0):
+        if whence == 0:
+            self.position = offset
+        elif whence == 1:
+            self.position += offset
+        elif whence == 2:
+            self.position = self.end + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}.")
+            
+    def _reserve(self, length):
+        start = self.position
+        end = start + length
+        if end > len(self.buffer):
+            self.buffer.extend(bytes(max(end, 2*len(self.buffer)) - len(self.buffer)))
+        self.position = end
+        if end > self.end:
+            self.end = end
+        return start
+    
+    def _write(self, data):
+        start = self._reserve(len(data))
+        self.buffer[start:self.position] = data
+    
+    def _rw_single(self, typecode, size, value, endianness=None):
+        if endianness is None:
+            endianness = self.context.endianness
+        struct.pack_into(endianness + typecode, self.buffer, self._reserve(size), value)
+        return value
+            
+    def _rw_multiple(self, typecode, size, value, shape, endianness=None):
+        if endianness is None:
+            endianness = self.context.endianness
+        
+        shape, n_to_read = get_shape_count(shape)
+        self._write(array_to_bytes(value, typecode, size, shape, n_to_read, endianness))
+        return value
+    
+    def rw_packed(self, packer, value):
+        packer.pack_into(self.buffer, self._reserve(packer.size), *value)
+        return value
+    
+    def rw_bytes(self, value, length):
+        self._write(value)
+        return value
+        
+    def rw_str(self, value, length, encoding='ascii'):
+        self._write(value.encode(encoding))
+        return value
+        
+    def rw_cstr(self, value, encoding='ascii', end_char=b'\x00'):
+        self._write(string_pool.encode_cstr(value, (encoding,), end_char))
+        return value
+    
+    def align(self, offset, alignment, padval=b'\x00'):
+        n_to_read = (alignment - (offset % alignment)) % alignment
+        self._write(padval * (n_to_read // len(padval)))
+
+
 class OffsetTracker(ReadWriterBase):
     open_flags = None
     
@@ -380,26 +695,21 @@ class OffsetTracker(ReadWriterBase):
         return value
     
     def _rw_multiple(self, typecode, size, value, shape, endianness=None):
-        if not hasattr(shape, "__getitem__"):
-            shape = (shape,)
-        n_to_read = 1
-        for elem in shape:
-            n_to_read *= elem
-            
-        for i in range(n_to_read):
-            self.adv_offset(size)
-            
+        _, n_to_read = get_shape_count(shape)
+        self.adv_offset(size*n_to_read)
         return value
         
+    def rw_bytes(self, value, length):
+        self.adv_offset(length)
+        return value
+    
     def rw_str(self, value, length, encoding='ascii'):
         length = len(value.encode(encoding))
         self.adv_offset(length)
         return value
         
     def rw_cstr(self, value, encoding='ascii', end_char=b'\x00'):
-        out = value.encode(encoding) + end_char
-        length = len(out)
-        self.adv_offset(length)
+        self.adv_offset(len(string_pool.encode_cstr(value, (encoding,), end_char)))
         return value
     
     def align(self, offset, alignment, padval=b'\x00'):
@@ -437,94 +747,40 @@ class OffsetTracker(ReadWriterBase):
         pass
 
 
-class POF0Builder(OffsetTracker):
-    open_flags = None
-    
-    __slots__ = ("virtual_offset", "pointers")
-    
-    def __init__(self):
-        super().__init__()
-     
-    def rw_pointer(self, value, endianness=None):
-        if value != 0:
-            self.log_offset()
-        self.adv_offset(4)
-        return value
-        
-    def rw_pointers(self, value, shape, endianness=None):        
-        if not hasattr(shape, "__getitem__"):
-            shape = (shape,)
-        n_to_read = 1
-        for elem in shape:
-            n_to_read *= elem
-            
-        for i in range(n_to_read):
-            if value[i] != 0:
-                self.log_offset()
-            self.adv_offset(4)
-            
-        return value
+class OffsetRun:
+    __slots__ = ("type", "start", "count")
     
-    def mode(self):
-        return "POF0"
-
-class ArrayWrapper:
-    def __init__(self, type_, bitwidth, data):
+    def __init__(self, type_, start, count=1):
         self.type = type_
-        self.itemsize = bitwidth
-        self.data = array.array('I', data)
-    
-    def __len__(self):
-        return len(self.data)
-    
-    def __getitem__(self, idx):
-        return self.data[idx]
-    
-    def __iter__(self):
-        for elem in self.data:
-            yield elem
-    
-    def get_item_size(self):
-        return self.itemsize
+        self.start = start
+        self.count = count
     
     def __repr__(self):
-        return f"<ArrayWrapper><{self.itemsize}>{self.data}"
-
-class ENRSBuilder(OffsetTracker):
-    open_flags = None
-    
-    __slots__ = ("current_array", "current_array_member", "ref_endianness")
+        return f"<OffsetRun><{self.type}>{self.start}x{self.count}"
+
+def log_run(runs, type_, size, offset, count):
+    if len(runs):
+        run = runs[-1]
+        if run.type == type_ and run.start + run.count*size == offset:
+            run.count += count
+            return
+    runs.append(OffsetRun(type_, offset, count))
+
+# Array members are stored as (offset, signature), where the signature is a
+# tuple of (offset, count, type) runs relative to the member offset. Equal
+# signatures are interned, so members with the same layout share one object
+class ContentsArrays:
+    __slots__ = ("pointers", "signatures", "current_array", "current_array_member")
     
-    def __init__(self, ref_endianness):
-        super().__init__()
+    def __init__(self):
+        self.pointers = []
+        self.signatures = {}
         self.current_array = None
         self.current_array_member = None
-        self.ref_endianness = ref_endianness
-
-    def collate_array(self, ptr_array):
-        collated_array = []
-        working_array = [ptr_array[0][0]]
         
-        # Split offsets into contiguous ranges
-        for i, (elem, size) in enumerate(ptr_array[1:]):
-            prev_elem, prev_size = ptr_array[i]
-            
-            is_same_bitwidth = prev_size == size
-            is_contiguous = elem == prev_elem + prev_size
-            if (not is_contiguous) or (not is_same_bitwidth):
-                collated_array.append(ArrayWrapper(prev_size >> 2, prev_size, working_array))
-                working_array = []
-            working_array.append(elem)
-        
-        # Add final array
-        elem, size = ptr_array[-1]
-        collated_array.append(ArrayWrapper(size >> 2, size, working_array))
-        return collated_array
-
     def mark_new_contents_array(self):
         if self.current_array is not None:
-            if len(self.current_array_member):
-                self.current_array.append(self.collate_array(self.current_array_member))
+            self.close_array_member()
             if len(self.current_array):
                 self.pointers.append(self.current_array)
         self.current_array = []
@@ -532,120 +788,92 @@ class ENRSBuilder(OffsetTracker):
     
     def mark_new_contents_array_member(self):
         if self.current_array_member is not None:
-            if len(self.current_array_member):
-                self.current_array.append(self.collate_array(self.current_array_member))
+            self.close_array_member()
         self.current_array_member = []
         
-    def log_offset(self, size):
-        if size > 1:
-            self.current_array_member.append((self.virtual_offset, size))
+    def close_array_member(self):
+        member = self.current_array_member
+        if len(member):
+            offset = member[0].start
+            signature = tuple((run.start - offset, run.count, run.type) for run in member)
+            signature = self.signatures.setdefault(signature, signature)
+            self.current_array.append((offset, signature))
+        
+    def log_run(self, type_, size, offset, count):
+        log_run(self.current_array_member, type_, size, offset, count)
+
+
+# Collects the POF0, ENRS and CCRS data in a single traversal
+class RelocationBuilder(OffsetTracker):
+    open_flags = None
+    
+    __slots__ = ("ref_endianness", "pof0_offset", "pof0_pointers", "enrs", "ccrs")
+    
+    def __init__(self, ref_endianness, pof0_offset=0):
+        super().__init__()
+        self.ref_endianness = ref_endianness
+        self.pof0_offset = pof0_offset
+        self.pof0_pointers = []
+        self.enrs = ContentsArrays()
+        self.ccrs = ContentsArrays()
+        
+    def mark_new_contents_array(self):
+        self.enrs.mark_new_contents_array()
+        self.ccrs.mark_new_contents_array()
+        
+    def mark_new_contents_array_member(self):
+        self.enrs.mark_new_contents_array_member()
+        self.ccrs.mark_new_contents_array_member()
+        
+    def rw_pointer(self, value, endianness=None):
+        if value != 0:
+            self.pof0_pointers.append(self.virtual_offset + self.pof0_offset)
+        return self._rw_single('I', 4, value, endianness)
+        
+    def rw_pointers(self, value, shape, endianness=None):
+        _, n_to_read = get_shape_count(shape)
+        offset = self.virtual_offset + self.pof0_offset
+        for i in range(n_to_read):
+            if value[i] != 0:
+                self.pof0_pointers.append(offset + 4*i)
+        return self._rw_multiple('I', 4, value, shape, endianness)
     
     def rw_pad8 (self, value, endianness=None): return super()._rw_single('B', 1, value, endianness)
     def rw_pad16(self, value, endianness=None): return super()._rw_single('H', 2, value, endianness)
     def rw_pad32(self, value, endianness=None): return super()._rw_single('I', 4, value, endianness)
     def rw_pad64(self, value, endianness=None): return super()._rw_single('Q', 8, value, endianness)
-
+    
     def _rw_single(self, typecode, size, value, endianness=None):
         if endianness is None:
             endianness = self.ref_endianness
-
-        if endianness == '>':
-            self.log_offset(size)
-        self.adv_offset(size)
+        
+        if endianness == '>' and size > 1:
+            self.enrs.log_run(size >> 2, size, self.virtual_offset, 1)
+        self.virtual_offset += size
         return value
-
+    
     def rw_pad8s (self, value, shape, endianness=None): return super()._rw_multiple('B', 1, value, shape, endianness)
     def rw_pad16s(self, value, shape, endianness=None): return super()._rw_multiple('H', 2, value, shape, endianness)
     def rw_pad32s(self, value, shape, endianness=None): return super()._rw_multiple('I', 4, value, shape, endianness)
     def rw_pad64s(self, value, shape, endianness=None): return super()._rw_multiple('Q', 8, value, shape, endianness)
-
+    
     def _rw_multiple(self, typecode, size, value, shape, endianness=None):
         if endianness is None:
             endianness = self.ref_endianness
             
-        if not hasattr(shape, "__getitem__"):
-            shape = (shape,)
-        n_to_read = 1
-        for elem in shape:
-            n_to_read *= elem
-            
-        for i in range(n_to_read):
-            if endianness == '>':
-                self.log_offset(size)
-            self.adv_offset(size)
-            
+        _, n_to_read = get_shape_count(shape)
+        if endianness == '>' and size > 1 and n_to_read > 0:
+            self.enrs.log_run(size >> 2, size, self.virtual_offset, n_to_read)
+        self.virtual_offset += size*n_to_read
         return value
-
-    def mode(self):
-        return "ENRS"
-
-class CCRSBuilder(OffsetTracker):
-    open_flags = None
-    
-    __slots__ = ("current_array", "current_array_member")
-
-    
-    def __init__(self):
-        super().__init__()
-        self.current_array = None
-        self.current_array_member = None
-
-    typewidths = {0 : 0x10,
-                  1 : 0x04,
-                  2 : 0x02,
-                  3 : 0x02,
-                  4 : 0x02,
-                  5 : 0x02}
-
-    def collate_array(self, ptr_array):
-        collated_array = []
-        if not len(ptr_array):
-            return []
-        working_array = [ptr_array[0][0]]
-        # Split offsets into contiguous ranges
-        for i, (elem, type_) in enumerate(ptr_array[1:]):
-            prev_elem, prev_type_ = ptr_array[i]
-            is_same_type = prev_type_ == type_
-            prev_size = self.typewidths[prev_type_]
-            is_contiguous = elem == prev_elem + prev_size
-            if (not is_contiguous) or (not is_same_type):
-                collated_array.append(ArrayWrapper(prev_type_, prev_size, working_array))
-                working_array = []
-            working_array.append(elem)
-        
-        # Add final array
-        elem, type_ = ptr_array[-1]
-        collated_array.append(ArrayWrapper(type_, self.typewidths[type_], working_array))
-        
-        return collated_array
-
-    def mark_new_contents_array(self):
-        if self.current_array is not None:
-            if len(self.current_array_member):
-                self.current_array.append(self.collate_array(self.current_array_member))
-            if len(self.current_array):
-                self.pointers.append(self.current_array)
-        self.current_array = []
-        self.current_array_member = []
     
-    def mark_new_contents_array_member(self):
-        if self.current_array_member is not None:
-            if len(self.current_array_member):
-                self.current_array.append(self.collate_array(self.current_array_member))
-        self.current_array_member = []
-        
-    def log_offset(self, type_):
-        self.current_array_member.append((self.virtual_offset, type_))
-      
     def rw_color128(self, value, endianness=None):
-        self.log_offset(0)
-        self.adv_offset(0x10)
-        return value
+        self.ccrs.log_run(0, 0x10, self.virtual_offset, 1)
+        return self._rw_multiple('f', 4, value, 4, endianness)
       
-    def rw_color32 (self, value, endianness=None): 
-        self.log_offset(1)
-        self.adv_offset(4)
-        return value
-
+    def rw_color32(self, value, endianness=None):
+        self.ccrs.log_run(1, 0x04, self.virtual_offset, 1)
+        return self._rw_single('I', 4, value, endianness)
+    
     def mode(self):
-        return "CCRS"
+        return "Relocations"
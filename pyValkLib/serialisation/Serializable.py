@@ -1,6 +1,4 @@
-import copy
-
-from .ReadWriter import Reader, Writer, Context
+from .ReadWriter import BufferReader, BufferWriter, Context
 
 
 class Serializable:
@@ -13,15 +11,21 @@ class Serializable:
     __slots__ = ("context",)
     
     def __init__(self, context):
-        self.context = copy.deepcopy(context)
+        self.context = context
     
-    def read(self, filepath):
-        with Reader(filepath) as rw:
+    def read(self, source, profiler=None):
+        with BufferReader(source) as rw:
+            if profiler is not None:
+                profiler.attach(rw)
             rw.rw_obj(self)
             
-    def write(self, filepath):
-        with Writer(filepath) as rw:
+    def write(self, filepath=None, size=0, profiler=None):
+        with BufferWriter(filepath, size) as rw:
+            if profiler is not None:
+                profiler.attach(rw)
             rw.rw_obj(self)
+        if filepath is None:
+            return rw.getvalue()
 
     def read_write(self, rw):
         raise NotImplementedError
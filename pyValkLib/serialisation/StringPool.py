@@ -0,0 +1,98 @@
+# Both tables are least-recently-used, so the pool stays bounded over a batch
+class StringPool:
+    __slots__ = ("max_entries", "strings", "encoded", "stats")
+
+    stat_names = ("intern_calls", "intern_hits", "decode_calls", "decode_hits", "encode_calls", "encode_hits")
+
+    def __init__(self, max_entries=0x10000):
+        self.max_entries = max_entries
+        self.strings = {}
+        self.encoded = {}
+        self.stats = dict.fromkeys(self.stat_names, 0)
+
+    def intern(self, string):
+        self.stats["intern_calls"] += 1
+        pooled = self.strings.pop(string, None)
+        if pooled is None:
+            pooled = string
+            if len(self.strings) >= self.max_entries:
+                del self.strings[next(iter(self.strings))]
+        else:
+            self.stats["intern_hits"] += 1
+        self.strings[pooled] = pooled
+        return pooled
+
+    def decode(self, raw, decoder, cache):
+        # The raw bytes are cached in a dict owned by the caller, so that
+        # they are only kept while the file they came from is being read
+        self.stats["decode_calls"] += 1
+        key = (decoder, raw)
+        string = cache.get(key)
+        if string is None:
+            string = self.intern(decoder(raw))
+            cache[key] = string
+        else:
+            self.stats["decode_hits"] += 1
+        return string
+
+    def get_encoded(self, string, encodings=("ascii",), end_char=b"\x00"):
+        self.stats["encode_calls"] += 1
+        key = (string, encodings, end_char)
+        entry = self.encoded.pop(key, None)
+        if entry is None:
+            entry = encode_first_fit(string, encodings)
+            entry = (entry[0], entry[1] + end_char)
+            if len(self.encoded) >= self.max_entries:
+                del self.encoded[next(iter(self.encoded))]
+        else:
+            self.stats["encode_hits"] += 1
+        self.encoded[key] = entry
+        return entry
+
+    def encode_cstr(self, string, encodings=("ascii",), end_char=b"\x00"):
+        return self.get_encoded(string, encodings, end_char)[1]
+
+    def clear(self):
+        self.strings.clear()
+        self.encoded.clear()
+        for name in self.stat_names:
+            self.stats[name] = 0
+
+    def to_dict(self):
+        out = dict(self.stats)
+        out["unique_strings"] = len(self.strings)
+        return out
+
+    def __repr__(self):
+        return f"String Pool: {len(self.strings)} unique strings. " \
+               f"Interned {self.stats['intern_hits']}/{self.stats['intern_calls']}, " \
+               f"decoded {self.stats['decode_hits']}/{self.stats['decode_calls']}, " \
+               f"encoded {self.stats['encode_hits']}/{self.stats['encode_calls']} from the pool."
+
+
+# Encodings that represent ASCII text as plain ASCII bytes
+ascii_compatible_encodings = {"ascii", "cp932", "shift_jis", "utf8", "utf-8"}
+
+# A lossy and a dropping pass only agree if nothing was lost, which is
+# exactly when a strict pass would succeed. Checking that the replaced bytes
+# decode back to the string would be wrong for cp932, which encodes a few
+# characters (e.g. U+301C) to bytes that decode as a different code point
+def encode_first_fit(string, encodings):
+    if string.isascii() and encodings[0] in ascii_compatible_encodings:
+        return encodings[0], string.encode("ascii")
+    for encoding in encodings[:-1]:
+        raw = string.encode(encoding, "replace")
+        if raw == string.encode(encoding, "ignore"):
+            return encoding, raw
+    return encodings[-1], string.encode(encodings[-1])
+
+def decode_first_fit(raw, encodings):
+    if raw.isascii() and encodings[0] in ascii_compatible_encodings:
+        return raw.decode("ascii")
+    for encoding in encodings[:-1]:
+        string = raw.decode(encoding, "replace")
+        if string == raw.decode(encoding, "ignore"):
+            return string
+    return raw.decode(encodings[-1])
+
+string_pool = StringPool()
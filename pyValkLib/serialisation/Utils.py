@@ -1,5 +1,33 @@
+import bisect
+
+
 def chunk_list(lst, chunksize):
     return [lst[i:i + chunksize] for i in range(0, len(lst), chunksize)]
 
 def flatten_list(lst):
     return [subitem for item in lst for subitem in item]
+
+# Maps the offset of each string in the blob to its raw bytes
+def split_cstr_bank(blob, start_pos=0, end_char=b"\x00"):
+    bank = {}
+    offset = start_pos
+    step = len(end_char)
+    for raw in bytes(blob).split(end_char):
+        bank[offset] = raw
+        offset += len(raw) + step
+    return bank
+
+def get_banked_string(string_bank, string_offsets, ptr):
+    # Pointers into the middle of a string get the tail of the string that
+    # contains them
+    raw = string_bank.get(ptr)
+    if raw is None:
+        idx = bisect.bisect_right(string_offsets, ptr) - 1
+        if idx < 0:
+            raise IndexError(f"String at {ptr} is before the start of the string bank.")
+        start = string_offsets[idx]
+        raw = string_bank[start]
+        if ptr - start > len(raw):
+            raise IndexError(f"String at {ptr} is not null-terminated.")
+        raw = raw[ptr - start:]
+    return raw
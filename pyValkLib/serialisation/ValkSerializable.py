@@ -1,5 +1,4 @@
-import copy
-from .ReadWriter import POF0Builder, ENRSBuilder
+from .ReadWriter import RelocationBuilder
 from .Serializable import Serializable, Context
     
         
@@ -60,9 +59,9 @@ class ValkSerializable(Serializable):
     FILETYPE=None
     
     def __init__(self, containers, endianness=None):
-        context = Context()
+        context = Context.get()
         if endianness is not None:
-            context.endianness = endianness 
+            context = context.with_endianness(endianness)
         super().__init__(context)
         self.header = None
         self.start_pos = None
@@ -114,26 +113,19 @@ class ValkSerializable(Serializable):
             print("body len:   ", self.header.contents_length)
             raise e
 
-    def buildPOF0(self):
-        pof0_info = POF0Builder()
-        pof0_info.context = copy.deepcopy(self.context)
-        pof0_info.anchor_pos = -self.header.header_length
-        self.read_write_contents(pof0_info)
-        return pof0_info
-
-    def buildENRS(self):
-        enrs_info = ENRSBuilder('>')
-        enrs_info.context = copy.deepcopy(self.context)
-        enrs_info.anchor_pos = -self.header.header_length
-        self.read_write_contents(enrs_info)
-        return enrs_info
+    def buildRelocations(self):
+        relocation_info = RelocationBuilder(self.context.endianness, self.header.header_length)
+        relocation_info.context = self.context
+        relocation_info.anchor_pos = -self.header.header_length
+        self.read_write_contents(relocation_info)
+        return relocation_info
 
 
 class ValkSerializable16BH(ValkSerializable):
     def __init__(self, containers, endianness=None):
         super().__init__(containers, endianness)
         self.header = Header16B(self.context, self.FILETYPE)
-        self.header.context.endianness = "<"
+        self.header.context = self.header.context.with_endianness("<")
         
     def check_data_size(self, rw):
         pass
@@ -143,7 +135,7 @@ class ValkSerializable32BH(ValkSerializable):
     def __init__(self, containers, endianness=None):
         super().__init__(containers, endianness)
         self.header = Header32B(self.context, self.FILETYPE)
-        self.header.context.endianness = "<"
+        self.header.context = self.header.context.with_endianness("<")
         
     def check_data_size(self, rw):
         rw.assert_local_file_pointer_now_at("End of Container Data", self.header.header_length + self.header.data_length)
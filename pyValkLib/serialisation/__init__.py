@@ -1,6 +1,10 @@
 if (__name__ == "__main__"):
-    from ReadWriter import Reader, Writer
+    from ReadWriter import Reader, BufferReader, Writer, BufferWriter
     from Serializable import Serializable
+    from Profiler import Profiler
+    from StringPool import StringPool, string_pool
 else:
-    from .ReadWriter import Reader, Writer
+    from .ReadWriter import Reader, BufferReader, Writer, BufferWriter
     from .Serializable import Serializable
+    from .Profiler import Profiler
+    from .StringPool import StringPool, string_pool
@@ -0,0 +1,128 @@
+from pyValkLib.utils.Compression.integers import compressedIntSize, packInt, unpackInt
+
+
+# Components are (jump, count, type) runs, where 'jump' is measured from the
+# end of the previous run, or from the start of the template
+class SCRunGroup:
+    __slots__ = ("offset", "stride", "count", "components")
+
+    def __init__(self, offset, stride, count, components):
+        self.offset = offset
+        self.stride = stride
+        self.count = count
+        self.components = tuple(components)
+
+    def __repr__(self):
+        return f"<SCRunGroup> Offset: {self.offset} Stride: {self.stride} Count: {self.count} Components: {self.components}"
+
+    def __eq__(self, other):
+        return type(self) is type(other) \
+           and self.offset == other.offset \
+           and self.stride == other.stride \
+           and self.count == other.count \
+           and self.components == other.components
+
+    def get_template_runs(self, type_sizes):
+        runs = []
+        prev_offset = 0
+        for jump, count, type_ in self.components:
+            start = prev_offset + jump
+            runs.append((start, count, type_))
+            prev_offset = start + count*type_sizes[type_]
+        return runs
+
+    def get_extent(self, type_sizes):
+        start, count, type_ = self.get_template_runs(type_sizes)[-1]
+        return self.stride*(self.count - 1) + start + count*type_sizes[type_]
+
+    def iter_runs(self, type_sizes):
+        template_runs = self.get_template_runs(type_sizes)
+        for i in range(self.count):
+            template_offset = self.offset + i*self.stride
+            for start, count, type_ in template_runs:
+                yield template_offset + start, count, type_
+
+    def iter_offsets(self, type_sizes):
+        for start, count, type_ in self.iter_runs(type_sizes):
+            size = type_sizes[type_]
+            for i in range(count):
+                yield start + i*size, type_
+
+
+# Template instances are (offset, signature) pairs, as built by make_template.
+# The signatures of a pack must be interned, as ContentsArrays does, since
+# they are compared by identity
+def runs_to_groups(packs, type_sizes):
+    groups = []
+    for pack in packs:
+        offset, signature = pack[0]
+
+        components = []
+        prev_offset = 0
+        for start, count, type_ in signature:
+            components.append((start - prev_offset, count, type_))
+            prev_offset = start + count*type_sizes[type_]
+
+        # A single template instance never applies its stride; the files
+        # store 1 for it
+        if len(pack) > 1:
+            stride = pack[1][0] - offset
+        else:
+            stride = 1
+
+        template_offset = offset
+        for instance_offset, instance_signature in pack:
+            if instance_signature is not signature or instance_offset != template_offset:
+                raise TypeError("Attempted to append a Template Instance that did not match the Template.")
+            template_offset += stride
+
+        groups.append(SCRunGroup(offset, stride, len(pack), components))
+    return groups
+
+def make_template(runs):
+    offset = runs[0][0]
+    return offset, tuple((start - offset, count, type_) for start, count, type_ in runs)
+
+def encode_groups(groups, pack_component, component_size, alignment=0x10):
+    size = 0
+    prev_offset = 0
+    for group in groups:
+        size += compressedIntSize(group.offset - prev_offset) \
+              + compressedIntSize(len(group.components)) \
+              + compressedIntSize(group.stride) \
+              + compressedIntSize(group.count)
+        prev_offset = group.offset
+        for jump, count, type_ in group.components:
+            size += component_size(jump, count, type_)
+    size += (alignment - (size % alignment)) % alignment
+
+    out = bytearray(size)
+    cursor = 0
+    prev_offset = 0
+    for group in groups:
+        cursor = packInt(out, cursor, group.offset - prev_offset)
+        cursor = packInt(out, cursor, len(group.components))
+        cursor = packInt(out, cursor, group.stride)
+        cursor = packInt(out, cursor, group.count)
+        prev_offset = group.offset
+
+        for jump, count, type_ in group.components:
+            cursor = pack_component(out, cursor, jump, count, type_)
+    return bytes(out)
+
+def decode_groups(num_groups, data, unpack_component):
+    data = memoryview(data)
+    cursor = 0
+    groups = []
+    offset = 0
+    for _ in range(num_groups):
+        jump,         cursor = unpackInt(data, cursor)
+        n_components, cursor = unpackInt(data, cursor)
+        stride,       cursor = unpackInt(data, cursor)
+        count,        cursor = unpackInt(data, cursor)
+        offset += jump
+        components = [None]*n_components
+        for i in range(n_components):
+            components[i], cursor = unpack_component(data, cursor)
+        groups.append(SCRunGroup(offset, stride, count, components))
+    return groups
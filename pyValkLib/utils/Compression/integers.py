@@ -1,128 +1,67 @@
-#################
-# DECOMPRESSION #
-#################
-def parseCompressedInt(ENRS_iter, byte_power, bytecode_value):
-    for _ in range((1 << byte_power) - 1):
-        elem = next(ENRS_iter)
-        bytecode_value <<= 8
-        bytecode_value |= elem
-        
-    return bytecode_value
-
-def decompressInt(ENRS_iter):
-    elem = next(ENRS_iter)
-    byte_power     = (elem & 0xC0) >> 6
-    bytecode_value = (elem & 0x3F) >> 0
-    
-    return parseCompressedInt(ENRS_iter, byte_power, bytecode_value)
-
-
-def decompressSubStencil(ENRS_iter):
-    elem = next(ENRS_iter)
-    byte_power       = (elem & 0xC0) >> 6
-    array_byte_power = (elem & 0x30) >> 4
-    bytecode_value   = (elem & 0x0F) >> 0
-    
-    return parseCompressedInt(ENRS_iter, byte_power, bytecode_value), array_byte_power
-
-###############
-# COMPRESSION #
-###############
-def compressInt(integer):
-    data = []
+# These read from and write to a buffer at an integer cursor, returning the
+# updated cursor, so that whole streams can be processed without building
+# intermediate lists or iterators.
+def compressedIntSize(integer):
     if integer < 2**6:
-        power_val = 0x00
-        
-        byte_1 = (integer & 0x3F) >> 0x00
-        
-        data.append(power_val | byte_1)
+        return 1
     elif integer < 2**14:
-        power_val = 0x40
-        
-        byte_1 = (integer & 0x3F00) >> 0x08
-        byte_2 = (integer & 0x00FF) >> 0x00
-        
-        data.append(power_val | byte_1)
-        data.append(byte_2)
+        return 2
     elif integer < 2**30:
-        power_val = 0x80
-        
-        byte_1 = (integer & 0x3F000000) >> 0x18
-        byte_2 = (integer & 0x00FF0000) >> 0x10
-        byte_3 = (integer & 0x0000FF00) >> 0x08
-        byte_4 = (integer & 0x000000FF) >> 0x00
-        
-        data.append(power_val | byte_1)
-        data.append(byte_2)
-        data.append(byte_3)
-        data.append(byte_4)
+        return 4
     else:
         raise ValueError(f"Int can be no larger than 2**30: {integer}.")
-    return data
 
-def compressSubStencil(starting_offset, diff):
-    data = []
-    elem_byte_power = (diff << 4) & 0x30
+def compressedSubStencilSize(starting_offset):
     if starting_offset < 2**4:
-        power_val = 0x00
-        
-        byte_1 = (starting_offset & 0x0F) >> 0x00
-        
-        data.append(power_val | elem_byte_power | byte_1)
+        return 1
     elif starting_offset < 2**12:
-        power_val = 0x40
-        
-        byte_1 = (starting_offset & 0x0F00) >> 0x08
-        byte_2 = (starting_offset & 0x00FF) >> 0x00
-        
-        data.append(power_val | elem_byte_power | byte_1)
-        data.append(byte_2)
+        return 2
     elif starting_offset < 2**28:
-        power_val = 0x80
-        
-        byte_1 = (starting_offset & 0x0F000000) >> 0x18
-        byte_2 = (starting_offset & 0x00FF0000) >> 0x10
-        byte_3 = (starting_offset & 0x0000FF00) >> 0x08
-        byte_4 = (starting_offset & 0x000000FF) >> 0x00
-        
-        data.append(power_val | elem_byte_power | byte_1)
-        data.append(byte_2)
-        data.append(byte_3)
-        data.append(byte_4)
+        return 4
+    else:
+        raise ValueError(f"Offset can be no larger than 2**28: {starting_offset}.")
+
+def packInt(buffer, cursor, integer):
+    if integer < 2**6:
+        buffer[cursor] = integer
+        return cursor + 1
+    elif integer < 2**14:
+        buffer[cursor]     = 0x40 | (integer >> 0x08)
+        buffer[cursor + 1] = integer & 0xFF
+        return cursor + 2
+    elif integer < 2**30:
+        buffer[cursor:cursor + 4] = (0x80000000 | integer).to_bytes(4, "big")
+        return cursor + 4
     else:
-        raise ValueError(f"Offset can be no larger than 2**28: {diff}.")
-    return data
+        raise ValueError(f"Int can be no larger than 2**30: {integer}.")
 
-def compressSubStencilOld(starting_offset, diff):
-    data = []
-    #elem_byte_power = (diff << 4) & 0x30
-    elem_byte_power = diff << 2
+def packSubStencil(buffer, cursor, starting_offset, diff):
+    elem_byte_power = (diff << 4) & 0x30
     if starting_offset < 2**4:
-        power_val = 0x00
-        
-        byte_1 = (starting_offset & 0x0F) >> 0x00
-        
-        data.append(power_val | elem_byte_power | byte_1)
+        buffer[cursor] = elem_byte_power | starting_offset
+        return cursor + 1
     elif starting_offset < 2**12:
-        power_val = 0x40
-        
-        byte_1 = (starting_offset & 0x0F00) >> 0x08
-        byte_2 = (starting_offset & 0x00FF) >> 0x00
-        
-        data.append(power_val | elem_byte_power | byte_1)
-        data.append(byte_2)
+        buffer[cursor]     = 0x40 | elem_byte_power | (starting_offset >> 0x08)
+        buffer[cursor + 1] = starting_offset & 0xFF
+        return cursor + 2
     elif starting_offset < 2**28:
-        power_val = 0x80
-        
-        byte_1 = (starting_offset & 0x0F000000) >> 0x18
-        byte_2 = (starting_offset & 0x00FF0000) >> 0x10
-        byte_3 = (starting_offset & 0x0000FF00) >> 0x08
-        byte_4 = (starting_offset & 0x000000FF) >> 0x00
-        
-        data.append(power_val | elem_byte_power | byte_1)
-        data.append(byte_2)
-        data.append(byte_3)
-        data.append(byte_4)
+        buffer[cursor:cursor + 4] = (0x80000000 | (elem_byte_power << 24) | starting_offset).to_bytes(4, "big")
+        return cursor + 4
     else:
-        raise ValueError(f"Offset can be no larger than 2**28: {diff}.")
-    return data
+        raise ValueError(f"Offset can be no larger than 2**28: {starting_offset}.")
+
+def unpackInt(data, cursor):
+    elem = data[cursor]
+    end = cursor + (1 << (elem >> 6))
+    value = elem & 0x3F
+    for i in range(cursor + 1, end):
+        value = (value << 8) | data[i]
+    return value, end
+
+def unpackSubStencil(data, cursor):
+    elem = data[cursor]
+    end = cursor + (1 << (elem >> 6))
+    value = elem & 0x0F
+    for i in range(cursor + 1, end):
+        value = (value << 8) | data[i]
+    return value, (elem & 0x30) >> 4, end
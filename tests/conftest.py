@@ -0,0 +1,64 @@
+import array
+
+import pytest
+
+from pyValkLib import MXE
+from pyValkLib.containers.MXEN.MXEC.MXECInterface import MXECInterface, ParameterInterface, EntityInterface
+from pyValkLib.containers.MXEN.MXEC.MXECInterface import AssetInterface
+
+
+def new_parameter_set(mi, param_type, **values):
+    pi = ParameterInterface.init_from_type(param_type)
+    pi.ID = len(mi.param_sets)
+    pi.name = f"{param_type}_{pi.ID}"
+    for k in pi.parameters:
+        pi.parameters[k] = values.get(k, 0)
+    mi.param_sets.append(pi)
+    return pi
+
+def new_asset(mi, ext):
+    ai = AssetInterface()
+    ai.ID = len(mi.assets)
+    ai.asset_type, file_ext = AssetInterface.asset_defs[ext]
+    ai.filepath = f"../resource/mx/asset{ai.ID}.{file_ext}"
+    ai.unknown_id_1 = -1
+    ai.unknown_id_2 = -1
+    mi.assets.append(ai)
+    return ai
+
+# Each entity has one parameter set holding two strings, and every other
+# entity has an unknowns entry. The unknowns are byte-symmetric since they
+# are read back in native byte order. The colour gives the CCRS an entry
+def build_test_interface(n_entities=4):
+    mi = MXECInterface()
+    for i in range(n_entities):
+        ei = EntityInterface.init_from_type("AISlgUnitMxParamSolver")
+        ei.ID = i
+        ei.name = f"ユニット_{i}"
+        ei.controller_id = 0
+        ei.unknown = 0x0101010101010101*(i + 1) if i % 2 == 0 else None
+        for param_ref in ei.entity.parameters:
+            param_ref.param_id = new_parameter_set(mi, param_ref.type, unknown_0x00=f"name_{i}", unknown_0x04="テスト", unknown_0x08=i).ID
+        mi.entities.append(ei)
+
+    model, texture, cvd = new_asset(mi, "hmd"), new_asset(mi, "htx"), new_asset(mi, "cvd")
+    new_parameter_set(mi, "SlgEnTemplePartsParam", model_asset=model.ID, texture_asset=texture.ID, cvd_asset=cvd.ID)
+    new_parameter_set(mi, "HyColor", color=array.array('f', [0.25, 0.5, 0.75, 1.]))
+    return mi
+
+# Test modules take the builders through these, rather than importing conftest
+@pytest.fixture
+def interface_builder():
+    return build_test_interface
+
+@pytest.fixture
+def parameter_set_builder():
+    return new_parameter_set
+
+@pytest.fixture
+def mxe_interface():
+    return build_test_interface()
+
+@pytest.fixture
+def mxe_bytes(mxe_interface):
+    return MXE.init_from_mxecinterface(mxe_interface).write()
@@ -0,0 +1,32 @@
+import pytest
+
+from pyValkLib.utils.Compression.integers import compressedIntSize, packInt, unpackInt
+from pyValkLib.utils.Compression.integers import compressedSubStencilSize, packSubStencil, unpackSubStencil
+
+
+@pytest.mark.parametrize("integer, expected", [(0,       b"\x00"),
+                                               (2**6-1,  b"\x3F"),
+                                               (2**6,    b"\x40\x40"),
+                                               (2**14-1, b"\x7F\xFF"),
+                                               (2**14,   b"\x80\x00\x40\x00"),
+                                               (2**30-1, b"\xBF\xFF\xFF\xFF")])
+def test_int_roundtrip(integer, expected):
+    buffer = bytearray(6)
+    cursor = packInt(buffer, 1, integer)
+    assert cursor == 1 + len(expected) == 1 + compressedIntSize(integer)
+    assert bytes(buffer[1:cursor]) == expected
+    assert unpackInt(buffer, 1) == (integer, cursor)
+
+@pytest.mark.parametrize("starting_offset, diff, size", [(0, 2, 1), (2**4-1, 1, 1), (2**4, 0, 2),
+                                                         (2**12-1, 2, 2), (2**12, 1, 4), (2**28-1, 0, 4)])
+def test_sub_stencil_roundtrip(starting_offset, diff, size):
+    buffer = bytearray(4)
+    cursor = packSubStencil(buffer, 0, starting_offset, diff)
+    assert cursor == size == compressedSubStencilSize(starting_offset)
+    assert unpackSubStencil(buffer, 0) == (starting_offset, diff, cursor)
+
+def test_oversized_values_are_rejected():
+    with pytest.raises(ValueError):
+        packInt(bytearray(4), 0, 2**30)
+    with pytest.raises(ValueError):
+        packSubStencil(bytearray(4), 0, 2**28, 0)
@@ -0,0 +1,68 @@
+import mmap
+import types
+
+import pytest
+
+from pyValkLib import MXE, LazyMXE
+from pyValkLib.serialisation import ReadWriter
+
+
+def summarise_tables(mxec):
+    return {
+        "parameter_sets": [(entry.ID, entry.name_offset, entry.data_offset, entry.parameter_type, entry.data.data)
+                           for entry in mxec.parameter_sets_table.entries],
+        "entities":       [(entry.ID, entry.name_offset, entry.data_offset, entry.controller_entity_id, entry.unknown_data_ptr)
+                           for entry in mxec.entity_table.entries],
+        "paths":          [entry.name_offset for entry in mxec.pathing_table.entries],
+        "assets":         [(entry.ID, entry.folder_name_ptr, entry.file_name_ptr, entry.filetype)
+                           for entry in mxec.asset_table.entries]
+    }
+
+@pytest.fixture(params=["bytes", "path"])
+def mxe_source(request, tmp_path, mxe_bytes):
+    if request.param == "bytes":
+        return mxe_bytes
+    path = tmp_path / "test.mxe"
+    path.write_bytes(mxe_bytes)
+    return path
+
+def test_lazy_tables_match_a_full_read(mxe_source, mxe_bytes):
+    full = MXE()
+    full.read(mxe_bytes)
+    lazy = LazyMXE(mxe_source)
+    assert summarise_tables(lazy) == summarise_tables(full.MXEN.MXEC)
+    assert lazy.loaded_sections == {"parameter_sets_table", "entity_table", "pathing_table", "asset_table"}
+
+    for entry in lazy.asset_table.entries:
+        assert lazy.read_string(entry.file_name_ptr) == full.MXEN.MXEC.sjis_strings.at_ptr(entry.file_name_ptr)
+
+def test_untouched_tables_are_not_read(mxe_source):
+    lazy = LazyMXE(mxe_source)
+    assert lazy.MXEC.parameter_sets_table_ptr != 0
+    assert len(lazy.entity_table.entries) == 4
+    assert lazy.loaded_sections == {"entity_table"}
+    assert len(lazy.MXEC.parameter_sets_table.entries) == 0
+    assert len(lazy.MXEC.asset_table.entries) == 0
+
+def test_files_are_closed_after_each_read(monkeypatch, tmp_path, mxe_bytes):
+    opened = []
+    def tracked_open(*args, **kwargs):
+        opened.append(open(*args, **kwargs))
+        return opened[-1]
+
+    class TrackedMmap(mmap.mmap):
+        instances = []
+        def __init__(self, *args, **kwargs):
+            self.instances.append(self)
+
+    monkeypatch.setattr(ReadWriter, "open", tracked_open, raising=False)
+    monkeypatch.setattr(ReadWriter, "mmap", types.SimpleNamespace(mmap=TrackedMmap, ACCESS_READ=mmap.ACCESS_READ))
+
+    path = tmp_path / "test.mxe"
+    path.write_bytes(mxe_bytes)
+    lazy = LazyMXE(path)
+    lazy.parameter_sets_table
+    lazy.read_string(lazy.asset_table.entries[0].file_name_ptr)
+    assert len(opened) == len(TrackedMmap.instances) == 4
+    assert all(F.closed for F in opened)
+    assert all(mapped.closed for mapped in TrackedMmap.instances)
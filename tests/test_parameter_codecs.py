@@ -0,0 +1,72 @@
+import array
+import struct
+
+import pytest
+
+from pyValkLib.containers.MXEN.MXEC.ParameterEntry import param_structs, func_lookup, get_param_codecs, ParameterChunkCodec, ParameterSet
+from pyValkLib.serialisation.ReadWriter import BufferReader, BufferWriter, Reader, Writer
+
+
+def get_test_value(typecode, i):
+    if typecode[:3] == "pad":
+        return 0
+    elif typecode[:3] == "hex":
+        return "0x" + f"{i + 0x10:02x}"*(int(typecode[3:])//8)
+    elif typecode[:5] == "float":
+        return i + 0.5
+    elif typecode == "color32":
+        return [i, i + 1, i + 2, i + 3]
+    elif typecode == "color128":
+        return array.array('f', [i, i + 0.25, i + 0.5, i + 0.75])
+    elif typecode[:3] == "int":
+        return -i
+    else:
+        return i
+
+def normalise(value):
+    return list(value) if isinstance(value, (list, tuple, array.array)) else value
+
+# The member-by-member path that the chunk codecs replaced
+def rw_members(rw, data, fields):
+    for name, ktype in fields:
+        data[name] = func_lookup[ktype[1:]](rw, data[name], ktype[0])
+
+def check_parity(tmp_path, codecs, fields):
+    data = {name: get_test_value(ktype[1:], i) for i, (name, ktype) in enumerate(fields)}
+
+    with BufferWriter() as writer:
+        for codec in codecs:
+            codec.write(writer, data)
+    path = tmp_path / "members.bin"
+    with Writer(path) as rw:
+        rw_members(rw, dict(data), fields)
+    assert writer.getvalue() == path.read_bytes()
+
+    codec_data = {}
+    with BufferReader(path.read_bytes()) as rw:
+        for codec in codecs:
+            codec.read(rw, codec_data)
+    member_data = dict.fromkeys(data)
+    with Reader(path) as rw:
+        rw_members(rw, member_data, fields)
+    assert {k: normalise(v) for k, v in codec_data.items()} == {k: normalise(v) for k, v in member_data.items()}
+    assert {k: normalise(v) for k, v in codec_data.items()} == {k: normalise(v) for k, v in data.items()}
+
+@pytest.mark.parametrize("struct_type", sorted(param_structs))
+def test_codecs_match_member_reads_and_writes(tmp_path, struct_type):
+    for chunk, chunk_codecs in zip(param_structs[struct_type]["struct"], get_param_codecs(struct_type)):
+        check_parity(tmp_path, chunk_codecs, list(chunk.items()))
+
+def test_mixed_endianness_chunk_matches_member_reads_and_writes(tmp_path):
+    fields = [("a", "<int16"), ("b", "<hex32"), ("c", "<pad16"), ("d", ">color32"), ("e", ">color128"), ("f", "<float64")]
+    codecs = [ParameterChunkCodec("<", [(name, ktype[1:]) for name, ktype in fields[:3]]),
+              ParameterChunkCodec(">", [(name, ktype[1:]) for name, ktype in fields[3:5]]),
+              ParameterChunkCodec("<", [(name, ktype[1:]) for name, ktype in fields[5:]])]
+    check_parity(tmp_path, codecs, fields)
+
+def test_failed_chunks_are_reported_in_the_exception():
+    param_set = ParameterSet(None, "HyColor")
+    with BufferReader(b"\x00"*4) as rw:
+        with pytest.raises(ValueError, match="color for HyColor") as error:
+            param_set.rw_struct(rw)
+    assert isinstance(error.value.__cause__, struct.error)
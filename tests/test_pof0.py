@@ -0,0 +1,54 @@
+import array
+import random
+
+import pytest
+
+from pyValkLib.containers.POF0.POF0ReadWriter import compressPOF0, decompressPOF0
+
+
+# One entry at a time, as the format describes it
+def reference_compress(offsets):
+    data = bytearray()
+    previous_offset = 0
+    for offset in offsets:
+        diff = offset - previous_offset
+        if diff < 2**8:
+            data.append(0x40 | (diff >> 2))
+        elif diff < 2**16:
+            data += (0x8000 | (diff >> 2)).to_bytes(2, "big")
+        else:
+            data += (0xC0000000 | (diff >> 2)).to_bytes(4, "big")
+        previous_offset = offset
+    return bytes(data)
+
+def random_offsets(rng, n):
+    offsets = []
+    offset = 0
+    for _ in range(n):
+        offset += 4*rng.choice([rng.randrange(0, 2**6), rng.randrange(2**6, 2**14), rng.randrange(2**14, 2**22)])
+        offsets.append(offset)
+    return offsets
+
+def test_entry_widths():
+    assert compressPOF0([0x04, 0x104, 0x10104]) == bytes([0x41, 0x80, 0x40, 0xC0, 0x00, 0x40, 0x00])
+    assert compressPOF0([0xFC, 0xFFF8]) == bytes([0x7F, 0xBF, 0xBF])
+    assert compressPOF0([]) == b""
+
+def test_roundtrip_all_widths():
+    rng = random.Random(0)
+    for n in (1, 2, 10, 500):
+        offsets = random_offsets(rng, n)
+        data = compressPOF0(offsets)
+        assert data == reference_compress(offsets)
+        assert decompressPOF0(data) == array.array('I', offsets)
+
+def test_decode_skips_padding():
+    offsets = [0x08, 0x408, 0x40408, 0x4040C]
+    data = compressPOF0(array.array('I', offsets))
+    assert decompressPOF0(data + b"\x00"*3) == array.array('I', offsets)
+    assert decompressPOF0(memoryview(data + b"\x00")) == array.array('I', offsets)
+
+@pytest.mark.parametrize("offsets", [[2], [8, 4], [2**32]])
+def test_rejects_invalid_offsets(offsets):
+    with pytest.raises(ValueError):
+        compressPOF0(offsets)
@@ -0,0 +1,80 @@
+import json
+
+from pyValkLib import MXE
+from pyValkLib.serialisation import Reader, BufferReader, BufferWriter, Profiler
+
+
+def read_names(rw):
+    # Jumps ahead to read a name, then returns, as EntryTable does
+    start = rw.tell()
+    rw.seek(0x10)
+    rw.rw_bytes(None, 8)
+    rw.seek(start)
+
+def read_entries(rw):
+    rw.rw_section("inner", read_names)
+    rw.rw_uint32s(None, 2)
+
+def test_seeks_are_not_counted_as_bytes():
+    profiler = Profiler()
+    with BufferReader(bytes(0x20)) as rw:
+        profiler.attach(rw)
+        rw.rw_section("outer", read_entries)
+    records = profiler.to_dict()
+    assert list(records) == ["inner", "outer"]
+    assert records["inner"]["bytes"] == 8
+    assert records["outer"]["bytes"] == 8 + 8
+    assert records["outer"]["time"] >= records["inner"]["time"]
+
+def test_writer_seeks_are_not_counted_as_bytes():
+    profiler = Profiler()
+    def write_header(rw):
+        rw.rw_uint32(0)
+        rw.seek(0x20)
+        rw.rw_uint32(1)
+    with BufferWriter() as rw:
+        profiler.attach(rw)
+        rw.rw_section("header", write_header)
+    assert profiler.to_dict()["header"]["bytes"] == 8
+
+def test_file_reader_seeks_are_not_counted_as_bytes(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes(0x20))
+    profiler = Profiler()
+    with Reader(path) as rw:
+        profiler.attach(rw)
+        rw.rw_section("outer", read_entries)
+    assert profiler.to_dict()["outer"]["bytes"] == 8 + 8
+
+def test_seeks_are_only_tracked_with_a_profiler():
+    with BufferReader(bytes(0x20)) as rw:
+        rw.seek(0x10)
+        assert type(rw) is BufferReader
+        assert rw.seek_displacement == 0
+        Profiler().attach(rw)
+        rw.seek(0x18)
+        assert isinstance(rw, BufferReader)
+        assert rw.seek_displacement == 8
+
+def test_sections_are_nested_within_their_containers(mxe_bytes):
+    profiler = Profiler()
+    MXE.init_from_file(mxe_bytes, profiler=profiler)
+    records = profiler.to_dict()
+    assert records["MXE"]["calls"] == 1
+    assert records["MXEC"]["bytes"] <= records["MXEN"]["bytes"] <= records["MXE"]["bytes"]
+    sections = [name for name in records if name.startswith("MXEC.")]
+    assert sections == ["MXEC.fileinfo", "MXEC.parameter_sets_table", "MXEC.entity_table", "MXEC.pathing_table",
+                        "MXEC.asset_table", "MXEC.strings", "MXEC.unknowns"]
+    # The MXEC is its header, its sections and its subcontainers; the EOFC
+    # is an empty header
+    subcontainers = sum(records[name]["bytes"] for name in ("POF0", "ENRS", "CCRS")) + 0x20
+    assert records["MXEC"]["bytes"] == 0x20 + sum(records[name]["bytes"] for name in sections) + subcontainers
+
+def test_json_export_matches_the_records(tmp_path, mxe_interface):
+    profiler = Profiler()
+    MXE.init_from_mxecinterface(mxe_interface).write(profiler=profiler)
+    path = tmp_path / "profile.json"
+    out = profiler.to_json(path)
+    assert json.loads(out) == profiler.to_dict()
+    assert json.loads(path.read_text()) == profiler.to_dict()
+    assert profiler.to_dict()["MXE"]["bytes"] == len(MXE.init_from_mxecinterface(mxe_interface).write())
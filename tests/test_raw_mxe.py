@@ -0,0 +1,150 @@
+import array
+import struct
+
+import pytest
+
+from pyValkLib import MXE
+from pyValkLib.filetypes.RawMXE import RawMXE, compare_relocations, find_first_run_divergence, relocation_tables
+from pyValkLib.containers.ENRS.ENRSCompression import enrs_type_sizes
+from pyValkLib.containers.CCRS.CCRSCompression import ccrs_type_sizes
+
+
+# Asset filepaths are stored as a shared folder string and a file name
+def get_asset_name_range(raw, filepath):
+    name = filepath.rsplit("/", 1)[-1]
+    start = raw.buffer.index(b"\x00" + name.encode("ascii") + b"\x00") + 1
+    return start - raw.offsets["MXEC"], len(name)
+
+def test_splice_rejects_unaligned_size_change(mxe_interface, mxe_bytes):
+    raw = RawMXE(mxe_bytes)
+    offset, length = get_asset_name_range(raw, mxe_interface.assets[0].filepath)
+    with pytest.raises(ValueError):
+        raw.splice(offset, length, bytes(raw.buffer[raw.offsets["MXEC"] + offset:][:length]) + b"x"*12)
+    assert raw.write() == mxe_bytes
+
+def test_splice_aligned_size_change_rereads(mxe_interface, mxe_bytes):
+    raw = RawMXE(mxe_bytes)
+    filepath = mxe_interface.assets[0].filepath + "x"*16
+    offset, length = get_asset_name_range(raw, mxe_interface.assets[0].filepath)
+    raw.splice(offset, length, filepath.rsplit("/", 1)[-1].encode("ascii"))
+
+    spliced = MXE.init_from_file(raw.write())
+    assert [ai.filepath for ai in spliced.assets] == [filepath] + [ai.filepath for ai in mxe_interface.assets[1:]]
+    assert [pi.parameters for pi in spliced.param_sets] == [pi.parameters for pi in mxe_interface.param_sets]
+
+def test_splice_rejects_ranges_outside_whole_strings(mxe_interface, mxe_bytes):
+    raw = RawMXE(mxe_bytes)
+    bank_start, bank_end = raw.get_string_bank_range()
+    offset, length = get_asset_name_range(raw, mxe_interface.assets[0].filepath)
+    for bad_offset, bad_length in [(bank_start - 0x10, 0x20),             # Into the string bank
+                                   (offset, bank_end - offset + 0x10),    # Out of the string bank
+                                   (offset + 1, length - 1),              # Starts inside a string
+                                   (offset, length - 1)]:                 # Ends inside a string
+        with pytest.raises(ValueError):
+            raw.splice(bad_offset, bad_length, b"\x00"*(bad_length + 0x10))
+    assert raw.write() == mxe_bytes
+
+def test_splice_rejects_ranges_outside_the_tables(mxe_bytes):
+    raw = RawMXE(mxe_bytes)
+    data_end = raw.headers["MXEC"].header_length + raw.headers["MXEC"].data_length
+    for bad_offset, bad_length in [(0x20, 0x10),      # The file info
+                                   (data_end, 0x10)]: # The subcontainers
+        with pytest.raises(ValueError):
+            raw.splice(bad_offset, bad_length, b"\x00"*(bad_length + 0x10))
+    assert raw.write() == mxe_bytes
+
+def test_splice_padding_keeps_interface(mxe_interface, mxe_bytes):
+    raw = RawMXE(mxe_bytes)
+    offset, length = get_asset_name_range(raw, mxe_interface.assets[0].filepath)
+    raw.splice(offset, length, bytes(raw.buffer[raw.offsets["MXEC"] + offset:][:length]) + b"\x00"*0x10)
+
+    spliced = MXE.init_from_file(raw.write())
+    assert [ai.filepath for ai in spliced.assets] == [ai.filepath for ai in mxe_interface.assets]
+    assert [ei.name for ei in spliced.entities] == [ei.name for ei in mxe_interface.entities]
+    assert [ei.unknown for ei in spliced.entities] == [ei.unknown for ei in mxe_interface.entities]
+
+# The set's data goes at the end of the parameter data, and its entry header
+# at the end of the entry headers; both move everything after them by 0x10
+def test_splice_appends_parameter_set(mxe_interface, mxe_bytes, parameter_set_builder):
+    base = MXE()
+    base.read(mxe_bytes)
+    mxec = base.MXEN.MXEC
+    table = mxec.parameter_sets_table
+    last_entry = table.entries.data[-1]
+    color = array.array('f', [1., 2., 3., 4.])
+
+    raw = RawMXE(mxe_bytes)
+    raw.splice(mxec.entity_table_ptr, 0, struct.pack(">4f", *color), enrs_runs=[(0, 4, 1)], ccrs_runs=[(0, 1, 0)])
+    headers_end = table.entry_ptr + 0x10*table.entry_count
+    header = struct.pack(">4I", table.entry_count, last_entry.name_offset + 0x20, 0x10, mxec.entity_table_ptr + 0x10)
+    raw.splice(headers_end, 0, header, pointers=[0x04, 0x0C], enrs_runs=[(0, 4, 1)])
+    raw.patch([(mxec.parameter_sets_table_ptr + 0x04, struct.pack(">I", table.entry_count + 1))])
+
+    # The new set shares its name with the last one, so the string bank is unchanged
+    pi = parameter_set_builder(mxe_interface, "HyColor", color=color)
+    pi.name = mxe_interface.param_sets[-2].name
+    assert raw.write() == MXE.init_from_mxecinterface(mxe_interface).write()
+
+def test_splice_rejects_ranges_cutting_through_relocations(mxe_bytes):
+    base = MXE()
+    base.read(mxe_bytes)
+    entry_ptr = base.MXEN.MXEC.parameter_sets_table.entry_ptr
+    raw = RawMXE(mxe_bytes)
+    with pytest.raises(ValueError):
+        raw.splice(entry_ptr + 0x08, 0x10, bytes(0x10))
+    with pytest.raises(ValueError):
+        raw.splice(entry_ptr, 0x10, bytes(0x10), pointers=[0x0E])
+    assert raw.write() == mxe_bytes
+
+def test_swap_endianness_reverses_each_relocated_value(mxe_bytes):
+    raw = RawMXE(mxe_bytes)
+    raw.swap_endianness()
+    swapped = raw.write()
+    assert RawMXE(swapped).endianness == "<"
+    for filetype in relocation_tables:
+        assert raw.get_data(filetype) == RawMXE(mxe_bytes).get_data(filetype)
+
+    expected = bytearray(mxe_bytes)
+    data_offset = raw.get_data_offset("MXEC")
+    for group in raw.get_enrs_groups():
+        for offset, type_ in group.iter_offsets(enrs_type_sizes):
+            start = data_offset + offset
+            end = start + enrs_type_sizes[type_]
+            expected[start:end] = expected[start:end][::-1]
+    assert swapped == expected
+
+    raw.swap_endianness()
+    assert raw.endianness == ">"
+    assert raw.write() == mxe_bytes
+
+def test_matching_relocations_have_no_divergences(mxe_bytes):
+    assert compare_relocations(RawMXE(mxe_bytes), RawMXE(mxe_bytes)) == []
+
+def test_run_divergences_are_found_per_item():
+    runs = [(0x00, 2, 2), (0x10, 3, 1), (0x40, 1, 0)]
+    assert find_first_run_divergence(runs, list(runs), enrs_type_sizes) is None
+    assert find_first_run_divergence(runs, [(0x00, 2, 2), (0x14, 3, 1), (0x40, 1, 0)], enrs_type_sizes) == (2, (0x10, 1), (0x14, 1))
+    assert find_first_run_divergence(runs, [(0x00, 2, 2), (0x10, 3, 0), (0x40, 1, 0)], enrs_type_sizes) == (2, (0x10, 1), (0x10, 0))
+    # Only the length differs, so the shorter run moves on to its next run
+    assert find_first_run_divergence(runs, [(0x00, 2, 2), (0x10, 2, 1), (0x40, 1, 0)], enrs_type_sizes) == (4, (0x18, 1), (0x40, 0))
+    assert find_first_run_divergence(runs, runs[:2], enrs_type_sizes) == (5, (0x40, 0), None)
+    assert find_first_run_divergence([], runs, enrs_type_sizes) == (0, None, (0x00, 2))
+
+def get_relocation_items(raw, filetype, type_sizes):
+    return [(start + i*type_sizes[type_], type_) for start, count, type_ in raw.get_relocation_runs(filetype) for i in range(count)]
+
+def test_first_relocation_divergences_are_reported(mxe_bytes, interface_builder):
+    # An extra entity moves every table after the first parameter sets
+    original = RawMXE(mxe_bytes)
+    rebuilt = RawMXE(MXE.init_from_mxecinterface(interface_builder(5)).write())
+    divergences = compare_relocations(original, rebuilt)
+    assert [filetype for filetype, *_ in divergences] == list(relocation_tables)
+
+    tables = {"POF0": (list(original.get_pof0_offsets()), list(rebuilt.get_pof0_offsets()))}
+    for filetype, type_sizes in [("ENRS", enrs_type_sizes), ("CCRS", ccrs_type_sizes)]:
+        tables[filetype] = (get_relocation_items(original, filetype, type_sizes), get_relocation_items(rebuilt, filetype, type_sizes))
+    for filetype, index, original_entry, rebuilt_entry in divergences:
+        original_entries, rebuilt_entries = tables[filetype]
+        assert original_entries[:index] == rebuilt_entries[:index]
+        assert (original_entry, rebuilt_entry) == (original_entries[index], rebuilt_entries[index])
+        assert original_entry != rebuilt_entry
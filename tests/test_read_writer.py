@@ -0,0 +1,101 @@
+import array
+import struct
+
+import pytest
+
+from pyValkLib.serialisation.ReadWriter import BufferReader, BufferWriter
+from pyValkLib.serialisation.PointerIndexableArray import PointerIndexableArray, PointerIndexableArrayUint32
+from pyValkLib.serialisation.Serializable import Context
+
+
+def test_writer_grows_past_its_initial_size():
+    with BufferWriter(size=4) as rw:
+        rw.rw_uint32(0x01020304, endianness=">")
+        rw.rw_bytes(b"\xAA"*0x100, 0x100)
+        rw.rw_uint16s([1, 2, 3], 3, endianness="<")
+        rw.rw_cstr("abc")
+    expected = b"\x01\x02\x03\x04" + b"\xAA"*0x100 + b"\x01\x00\x02\x00\x03\x00" + b"abc\x00"
+    assert rw.getvalue() == expected
+    assert len(rw.buffer) >= len(expected)
+
+def test_writer_seeks_back_without_truncating():
+    with BufferWriter() as rw:
+        rw.rw_bytes(b"\x00"*8, 8)
+        rw.seek(2)
+        rw.rw_uint16(0xFFFF)
+        assert rw.tell() == 4
+        rw.seek(0, 2)
+        rw.rw_uint8(1)
+    assert rw.getvalue() == b"\x00\x00\xFF\xFF\x00\x00\x00\x00\x01"
+
+def test_writer_flushes_to_file(tmp_path):
+    path = tmp_path / "out.bin"
+    with BufferWriter(path) as rw:
+        rw.rw_uint64(1, endianness="<")
+    assert path.read_bytes() == b"\x01" + b"\x00"*7
+
+def test_reader_reads_from_a_cursor():
+    data = b"\xFF\xFF\xFF\xFE" + b"\x00\x00\x00\x3F\x00\x00\xC0\x3F" + "テスト".encode("cp932") + b"\x00"
+    with BufferReader(memoryview(data)) as reader:
+        assert reader.rw_int32(None, endianness=">") == -2
+        assert list(reader.rw_float32s(None, 2, endianness="<")) == [0.5, 1.5]
+        assert reader.rw_cstr(None, encoding="cp932") == "テスト"
+        assert reader.tell() == len(data)
+        reader.assert_at_eof()
+
+def test_reader_reads_what_the_writer_wrote():
+    with BufferWriter() as rw:
+        rw.rw_int32(-2, endianness=">")
+        rw.rw_float32s([0.5, 1.5], 2, endianness="<")
+        rw.rw_cstr("テスト", encoding="cp932")
+        rw.align(rw.tell(), 0x10)
+    with BufferReader(memoryview(rw.getvalue())) as reader:
+        assert reader.rw_int32(None, endianness=">") == -2
+        assert list(reader.rw_float32s(None, 2, endianness="<")) == [0.5, 1.5]
+        assert reader.rw_cstr(None, encoding="cp932") == "テスト"
+        reader.align(reader.tell(), 0x10)
+        reader.assert_at_eof()
+
+def test_reader_rejects_short_arrays():
+    with BufferReader(b"\x00"*6) as rw:
+        with pytest.raises(struct.error):
+            rw.rw_uint32s(None, 2)
+
+def test_pointer_array_appends_in_offset_order():
+    array = PointerIndexableArray(Context.get())
+    for ptr in (0x10, 0x20, 0x20, 0x48):
+        array.append(ptr*2, ptr)
+    with pytest.raises(ValueError):
+        array.append(0, 0x18)
+    assert len(array) == 4
+    assert array.get_idx(0x20) == 1
+    assert array.get_idx(0x48) == 3
+    assert array.at_ptr(0x48) == 0x90
+    for missing in (0x00, 0x18, 0x50):
+        with pytest.raises(KeyError):
+            array.get_idx(missing)
+
+def test_pointer_array_offsets_are_only_recorded_once():
+    values = PointerIndexableArrayUint32(Context.get())
+    values.data = [1, 2, 3]
+    with BufferWriter() as rw:
+        values.read_write(rw)
+    assert list(values.offsets) == [0, 4, 8]
+    with BufferWriter() as rw:
+        values.read_write(rw)
+    assert list(values.offsets) == [0, 4, 8]
+    with BufferWriter() as rw:
+        rw.rw_uint32(0)
+        with pytest.raises(Exception):
+            values.read_write(rw)
+    assert list(values.offsets) == [0, 4, 8]
+
+def test_multi_dimensional_reads_are_nested_lists_of_rows():
+    values = [[[1, 2, 3], [4, 5, 6]], [[7, 8, 9], [10, 11, 12]]]
+    with BufferWriter() as rw:
+        rw.rw_uint16s(values, (2, 2, 3), endianness=">")
+    assert rw.getvalue() == b"".join(i.to_bytes(2, "big") for i in range(1, 13))
+    with BufferReader(rw.getvalue()) as reader:
+        data = reader.rw_uint16s(None, (2, 2, 3), endianness=">")
+    assert data == [[array.array('H', row) for row in rows] for rows in values]
+    assert type(data[0]) is list and type(data[0][0]) is array.array
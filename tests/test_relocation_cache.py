@@ -0,0 +1,76 @@
+import os
+
+from pyValkLib import MXE
+from pyValkLib.containers.MXEN.MXEC.RelocationCache import RelocationCache
+from pyValkLib.containers.MXEN.MXEC.MXECInterface import get_layout_fingerprint, clear_layout_schema_hash
+from pyValkLib.containers.MXEN.MXEC.ParameterEntry import param_structs
+
+
+entry = (b"\x01\x02", 3, b"\x03"*0x10, 1, b"\x04"*0x10)
+
+def test_entries_roundtrip(tmp_path):
+    cache = RelocationCache(tmp_path)
+    assert cache.get("key") is None
+    cache.put("key", *entry)
+    assert cache.get("key") == entry
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_damaged_entries_are_discarded(tmp_path):
+    cache = RelocationCache(tmp_path)
+    for key, damage in [("truncated_header", lambda data: data[:10]),
+                        ("truncated_data",   lambda data: data[:-1]),
+                        ("bad_magic",        lambda data: b"XXXX" + data[4:])]:
+        cache.put(key, *entry)
+        path = cache.get_path(key)
+        with open(path, 'rb') as F:
+            data = F.read()
+        with open(path, 'wb') as F:
+            F.write(damage(data))
+        assert cache.get(key) is None
+        assert not os.path.exists(path)
+    assert cache.misses == 3
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = RelocationCache(tmp_path, max_entries=2)
+    cache.put("a", *entry)
+    cache.put("b", *entry)
+    os.utime(cache.get_path("a"), (1, 1))
+    os.utime(cache.get_path("b"), (2, 2))
+    assert cache.get("a") == entry
+    cache.put("c", *entry)
+    assert sorted(os.listdir(tmp_path)) == ["a.reloc", "c.reloc"]
+
+def test_cached_relocations_match_rebuilt_ones(tmp_path, mxe_interface, mxe_bytes):
+    cache = RelocationCache(tmp_path)
+    assert MXE.init_from_mxecinterface(mxe_interface, relocation_cache=cache).write() == mxe_bytes
+    assert MXE.init_from_mxecinterface(mxe_interface, relocation_cache=cache).write() == mxe_bytes
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_string_lengths_change_the_layout(tmp_path, mxe_interface, mxe_bytes, interface_builder):
+    # The same number of strings, but long enough to move the unknowns
+    longer = interface_builder()
+    for pi in longer.param_sets[:4]:
+        pi.parameters["unknown_0x00"] += "_"*0x20
+    cache = RelocationCache(tmp_path)
+    assert MXE.init_from_mxecinterface(mxe_interface, relocation_cache=cache).write() == mxe_bytes
+    assert MXE.init_from_mxecinterface(longer, relocation_cache=cache).write() == MXE.init_from_mxecinterface(longer).write()
+    assert (cache.hits, cache.misses) == (0, 2)
+
+    # Moving bytes between two strings keeps the size of the string bank
+    moved = interface_builder()
+    moved.param_sets[0].parameters["unknown_0x00"] += "____"
+    moved.param_sets[1].parameters["unknown_0x00"] = "na"
+    moved_rw = MXE.init_from_mxecinterface(moved).MXEN.MXEC
+    mxec_rw = MXE.init_from_mxecinterface(mxe_interface).MXEN.MXEC
+    assert moved_rw.header.data_length == mxec_rw.header.data_length
+    assert get_layout_fingerprint(moved_rw) != get_layout_fingerprint(mxec_rw)
+
+def test_schema_changes_change_the_layout(monkeypatch, mxe_interface):
+    mxec_rw = MXE.init_from_mxecinterface(mxe_interface).MXEN.MXEC
+    key = get_layout_fingerprint(mxec_rw)
+    with monkeypatch.context() as patch:
+        patch.setitem(param_structs["AISlgUnitMxParam"]["struct"][0], "unknown_0x04", ">utf8_string")
+        clear_layout_schema_hash()
+        assert get_layout_fingerprint(mxec_rw) != key
+    clear_layout_schema_hash()
+    assert get_layout_fingerprint(mxec_rw) == key
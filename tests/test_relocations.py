@@ -0,0 +1,47 @@
+import pytest
+
+from pyValkLib.serialisation.ReadWriter import RelocationBuilder
+from pyValkLib.containers.ENRS.ENRSCompression import toENRSRuns
+from pyValkLib.utils.Compression.Stencilled.runs import SCRunGroup
+
+
+def build_array(rb, n_members):
+    rb.mark_new_contents_array()
+    for _ in range(n_members):
+        rb.mark_new_contents_array_member()
+        rb.rw_uint32(0)
+        rb.rw_uint16(0)
+        rb.rw_uint16(0)
+        rb.rw_pad32(0)
+        rb.rw_uint64(0)
+
+def test_repeated_members_share_one_signature():
+    rb = RelocationBuilder('>')
+    build_array(rb, 50)
+    rb.mark_new_contents_array()
+    
+    members = rb.enrs.pointers[0]
+    assert len(members) == 50
+    assert len(rb.enrs.signatures) == 1
+    assert all(signature is members[0][1] for _, signature in members)
+    assert toENRSRuns(rb.enrs.pointers) == [SCRunGroup(0, 0x14, 50, [(0, 1, 1), (0, 2, 0), (4, 1, 2)])]
+
+def test_signatures_are_shared_across_arrays():
+    rb = RelocationBuilder('>')
+    build_array(rb, 3)
+    build_array(rb, 4)
+    rb.mark_new_contents_array()
+    
+    first, second = rb.enrs.pointers
+    assert first[0][1] is second[0][1]
+    assert [group.count for group in toENRSRuns(rb.enrs.pointers)] == [3, 4]
+
+def test_mismatched_member_is_rejected():
+    rb = RelocationBuilder('>')
+    build_array(rb, 2)
+    rb.mark_new_contents_array_member()
+    rb.rw_uint16(0)
+    rb.mark_new_contents_array()
+    
+    with pytest.raises(TypeError):
+        toENRSRuns(rb.enrs.pointers)
@@ -0,0 +1,39 @@
+import pytest
+
+from pyValkLib.containers.ENRS.ENRSCompression import compressENRS, decompressENRS, enrs_type_sizes
+from pyValkLib.containers.CCRS.CCRSCompression import compressCCRS, decompressCCRS, ccrs_type_sizes
+from pyValkLib.filetypes.RawMXE import RawMXE
+from pyValkLib.utils.Compression.Stencilled.runs import SCRunGroup
+
+
+# Offsets and jumps straddle the 1-, 2- and 4-byte integer encodings
+enrs_groups = [SCRunGroup(0x3F,      1,      1,    [(0, 1, 1)]),
+               SCRunGroup(0x80,      0x14,   50,   [(0, 1, 1), (0, 2, 0), (4, 1, 2)]),
+               SCRunGroup(0x4080,    0x1000, 2**6, [(0xF, 3, 0), (0x10, 1, 2)]),
+               SCRunGroup(0x104080,  8,      3,    [(0xFFF, 1, 2), (0x1000, 2**6, 1)])]
+
+ccrs_groups = [SCRunGroup(0x40,      0x20,   2,    [(0, 1, 0), (0x3F, 2, 5)]),
+               SCRunGroup(0x4040,    4,      2**14,[(0x40, 1, 1)]),
+               SCRunGroup(0x404040,  1,      1,    [(0x4000, 3, 2)])]
+
+@pytest.mark.parametrize("compress, decompress, groups", [(compressENRS, decompressENRS, enrs_groups),
+                                                          (compressCCRS, decompressCCRS, ccrs_groups)])
+def test_groups_roundtrip(compress, decompress, groups):
+    data = compress(groups)
+    assert len(data) % 0x10 == 0
+    assert decompress(len(groups), data) == groups
+    assert compress(decompress(len(groups), data)) == data
+
+def test_empty_tables_are_empty():
+    assert compressENRS([]) == b""
+    assert decompressCCRS(0, b"") == []
+
+def test_fixture_tables_recompress_identically(mxe_bytes):
+    raw = RawMXE(mxe_bytes)
+    for filetype, compress, groups, type_sizes in [("ENRS", compressENRS, raw.get_enrs_groups(), enrs_type_sizes),
+                                                   ("CCRS", compressCCRS, raw.get_ccrs_groups(), ccrs_type_sizes)]:
+        assert len(groups)
+        data = compress(groups)
+        assert raw.get_data(filetype)[0x10:0x10 + len(data)] == data
+        offsets = [offset for group in groups for offset, _ in group.iter_offsets(type_sizes)]
+        assert offsets == sorted(set(offsets))
@@ -0,0 +1,43 @@
+from pyValkLib.serialisation.StringPool import StringPool, encode_first_fit, decode_first_fit
+
+
+def test_first_fit_picks_first_lossless_encoding():
+    assert encode_first_fit("abc", ("cp932", "utf8")) == ("cp932", b"abc")
+    assert encode_first_fit("テスト", ("cp932", "utf8")) == ("cp932", "テスト".encode("cp932"))
+    assert encode_first_fit("テストü", ("cp932", "utf8")) == ("utf8", "テストü".encode("utf8"))
+
+def test_first_fit_agrees_with_a_strict_encode():
+    # U+301C encodes to cp932, but decodes back as U+FF5E
+    assert encode_first_fit("テスト〜?", ("cp932", "utf8")) == ("cp932", "テスト〜?".encode("cp932"))
+    assert encode_first_fit("テスト?ü", ("cp932", "utf8")) == ("utf8", "テスト?ü".encode("utf8"))
+    assert decode_first_fit("テスト〜?".encode("cp932"), ("cp932", "utf8")) == "テスト～?"
+
+def test_first_fit_decodes_with_first_lossless_encoding():
+    assert decode_first_fit("テスト".encode("cp932"), ("cp932", "utf8")) == "テスト"
+    assert decode_first_fit("テストü".encode("utf8"), ("cp932", "utf8")) == "テストü"
+
+def test_encoding_is_stored_with_the_pooled_bytes():
+    pool = StringPool()
+    assert pool.get_encoded("テストü", ("cp932", "utf8")) == ("utf8", "テストü".encode("utf8") + b"\x00")
+    assert pool.encode_cstr("テストü", ("cp932", "utf8")) == "テストü".encode("utf8") + b"\x00"
+    assert pool.stats["encode_hits"] == 1
+
+def test_least_recently_used_strings_are_evicted():
+    pool = StringPool(max_entries=2)
+    a, b, c = "".join(["a", "b"]), "".join(["c", "d"]), "".join(["e", "f"])
+    assert pool.intern(a) is a
+    pool.intern(b)
+    assert pool.intern("".join(["a", "b"])) is a
+    pool.intern(c)
+    assert list(pool.strings) == [a, c]
+    assert pool.intern("".join(["c", "d"])) is not b
+    assert pool.stats["intern_hits"] == 1
+
+def test_least_recently_used_encodings_are_evicted():
+    pool = StringPool(max_entries=2)
+    pool.get_encoded("a")
+    pool.get_encoded("b")
+    pool.get_encoded("a")
+    pool.get_encoded("c")
+    assert [key[0] for key in pool.encoded] == ["a", "c"]
+    assert pool.stats["encode_hits"] == 1
@@ -0,0 +1,37 @@
+from pyValkLib import MXE
+from pyValkLib.containers.MXEN.MXEC.MXECInterface import MXECInterface
+from pyValkLib.containers.MXEN.MXEC.ValuePatch import get_value_patches
+from pyValkLib.filetypes.RawMXE import RawMXE
+
+
+def read_base(mxe_bytes):
+    base = MXE()
+    base.read(mxe_bytes)
+    return base.MXEN.MXEC, MXECInterface.from_subreader(base.MXEN.MXEC)
+
+def test_value_changes_patch_to_a_full_pack(mxe_bytes):
+    mxec_rw, old_mi = read_base(mxe_bytes)
+    new_mi = MXE.init_from_file(mxe_bytes)
+    new_mi.param_sets[0].parameters["unknown_0x08"] = 1234
+    new_mi.param_sets[-1].parameters["color"][2] = 0.125
+
+    patches = get_value_patches(mxec_rw, old_mi, new_mi)
+    assert len(patches) == 2
+    raw = RawMXE(mxe_bytes)
+    raw.patch(patches)
+    assert raw.write() == MXE.init_from_mxecinterface(new_mi).write()
+
+def test_unchanged_interface_has_no_patches(mxe_bytes):
+    mxec_rw, old_mi = read_base(mxe_bytes)
+    assert get_value_patches(mxec_rw, old_mi, MXE.init_from_file(mxe_bytes)) == []
+
+def test_layout_changes_fall_back_to_a_full_pack(mxe_bytes):
+    mxec_rw, old_mi = read_base(mxe_bytes)
+    for change in [lambda mi: mi.param_sets[0].parameters.update(unknown_0x00="renamed"),
+                   lambda mi: setattr(mi.param_sets[0], "name", "renamed"),
+                   lambda mi: setattr(mi.entities[1], "unknown", 0x0202020202020202),
+                   lambda mi: setattr(mi.assets[0], "filepath", "../resource/mx/renamed.hmd"),
+                   lambda mi: mi.param_sets.pop()]:
+        new_mi = MXE.init_from_file(mxe_bytes)
+        change(new_mi)
+        assert get_value_patches(mxec_rw, old_mi, new_mi) is None